@@ -5,7 +5,7 @@ Input validation and sanitization for webhook data.
 import html
 import json
 import re
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 from urllib.parse import unquote
 
 from .logging_config import get_logger
@@ -61,9 +61,9 @@ class WebhookSanitizer:
         self,
         method: str,
         path: str,
-        headers: Dict[str, str],
+        headers: Mapping[str, str],
         body: Any,
-        query_params: Dict[str, str],
+        query_params: Mapping[str, str],
         content_type: Optional[str] = None,
         content_length: Optional[int] = None
     ) -> Tuple[bool, Dict[str, Any], List[str]]:
@@ -166,7 +166,7 @@ class WebhookSanitizer:
             logger.error(f"Error sanitizing path: {e}")
             return False, path, [f"Error processing path: {str(e)}"]
     
-    def sanitize_headers(self, headers: Dict[str, str]) -> Tuple[bool, Dict[str, str], List[str]]:
+    def sanitize_headers(self, headers: Mapping[str, str]) -> Tuple[bool, Dict[str, str], List[str]]:
         """Sanitize HTTP headers."""
         warnings = []
         sanitized_headers = {}
@@ -211,7 +211,7 @@ class WebhookSanitizer:
         
         return sanitized.lower()
     
-    def sanitize_query_params(self, params: Dict[str, str]) -> Tuple[bool, Dict[str, str], List[str]]:
+    def sanitize_query_params(self, params: Mapping[str, str]) -> Tuple[bool, Dict[str, str], List[str]]:
         """Sanitize query parameters."""
         warnings = []
         sanitized_params = {}
@@ -435,9 +435,9 @@ webhook_sanitizer = WebhookSanitizer()
 def sanitize_webhook_data(
     method: str,
     path: str,
-    headers: Dict[str, str],
+    headers: Mapping[str, str],
     body: Any,
-    query_params: Dict[str, str],
+    query_params: Mapping[str, str],
     content_type: Optional[str] = None,
     content_length: Optional[int] = None
 ) -> Tuple[bool, Dict[str, Any], List[str]]:
@@ -5,10 +5,12 @@ This module provides a unified logging setup with configurable levels,
 formatters, and handlers for consistent logging across the application.
 """
 
+import bisect
 import gzip
 import logging
 import logging.handlers
 import os
+import shutil
 import sys
 import time
 import threading
@@ -16,6 +18,12 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, List
 
+# Name of the log file currently written to by the file handler
+_ACTIVE_LOG_NAME = 'sonar.log'
+
+# Buffer size for streaming decompressed log data to disk
+_COPY_BUFFER_SIZE = 1024 * 1024
+
 
 class SonarLoggerConfig:
     """Centralized logging configuration for Sonar application."""
@@ -33,6 +41,9 @@ class SonarLoggerConfig:
         'CRITICAL': logging.CRITICAL
     }
     
+    # Number of records buffered in memory before they are written to the log file
+    FILE_BUFFER_CAPACITY = 1024
+    
     def __init__(self):
         """Initialize the logging configuration."""
         self._configured = False
@@ -40,6 +51,7 @@ class SonarLoggerConfig:
         self._log_level = logging.INFO
         self._console_handler = None
         self._file_handler = None
+        self._file_target_handler = None
         self._detailed_logging = False
         self._is_global_instance = False
         
@@ -123,15 +135,8 @@ class SonarLoggerConfig:
             log_file.parent.mkdir(parents=True, exist_ok=True)
             self._log_dir = log_file.parent
             
-            # Use rotating file handler
-            self._file_handler = logging.handlers.RotatingFileHandler(
-                log_file,
-                maxBytes=max_file_size,
-                backupCount=backup_count,
-                encoding='utf-8'
-            )
-            self._file_handler.setLevel(self._log_level)
-            self._file_handler.setFormatter(formatter)
+            # Use buffered rotating file handler
+            self._create_file_handler(log_file, max_file_size, backup_count, formatter)
             root_logger.addHandler(self._file_handler)
             
             # Log the configuration
@@ -174,7 +179,43 @@ class SonarLoggerConfig:
             log_dir = Path.home() / '.config' / 'sonar' / 'logs'
         
         self._log_dir = log_dir
-        return log_dir / 'sonar.log'
+        return log_dir / _ACTIVE_LOG_NAME
+    
+    def _create_file_handler(
+        self,
+        log_file: Path,
+        max_file_size: int,
+        backup_count: int,
+        formatter: logging.Formatter
+    ) -> None:
+        """
+        Create the rotating file handler wrapped in a memory buffer.
+        
+        Records are batched in a MemoryHandler and written to the rotating
+        file handler in one go once the buffer is full or an ERROR (or worse)
+        record arrives, instead of issuing a write per record.
+        
+        Args:
+            log_file: Path to log file
+            max_file_size: Maximum size per log file in bytes
+            backup_count: Number of backup files to keep
+            formatter: Formatter applied to written records
+        """
+        self._file_target_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=max_file_size,
+            backupCount=backup_count,
+            encoding='utf-8'
+        )
+        self._file_target_handler.setLevel(self._log_level)
+        self._file_target_handler.setFormatter(formatter)
+        
+        self._file_handler = logging.handlers.MemoryHandler(
+            capacity=self.FILE_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=self._file_target_handler
+        )
+        self._file_handler.setLevel(self._log_level)
     
     def get_logger(self, name: str) -> logging.Logger:
         """
@@ -206,6 +247,8 @@ class SonarLoggerConfig:
             self._console_handler.setLevel(new_level)
         if self._file_handler:
             self._file_handler.setLevel(new_level)
+        if self._file_target_handler:
+            self._file_target_handler.setLevel(new_level)
         
         self._log_level = new_level
         
@@ -237,14 +280,7 @@ class SonarLoggerConfig:
         formatter = logging.Formatter(log_format)
         
         # Create and add file handler
-        self._file_handler = logging.handlers.RotatingFileHandler(
-            log_file,
-            maxBytes=max_file_size,
-            backupCount=backup_count,
-            encoding='utf-8'
-        )
-        self._file_handler.setLevel(self._log_level)
-        self._file_handler.setFormatter(formatter)
+        self._create_file_handler(log_file, max_file_size, backup_count, formatter)
         
         root_logger = logging.getLogger()
         root_logger.addHandler(self._file_handler)
@@ -262,12 +298,21 @@ class SonarLoggerConfig:
         
         root_logger = logging.getLogger()
         root_logger.removeHandler(self._file_handler)
+        # Closing the memory handler flushes buffered records to the target,
+        # but leaves the target itself open
         self._file_handler.close()
+        self._file_target_handler.close()
         self._file_handler = None
+        self._file_target_handler = None
         
         logger = logging.getLogger(__name__)
         logger.info("File logging removed")
     
+    def flush(self) -> None:
+        """Write any buffered log records to the log file."""
+        if self._file_handler:
+            self._file_handler.flush()
+    
     def get_log_directory(self) -> Optional[Path]:
         """Get the current log directory."""
         return self._log_dir
@@ -434,29 +479,18 @@ class SonarLoggerConfig:
         if not self._log_dir or not self._log_dir.exists():
             return []
         
-        log_files = []
-        
-        # Look for log files with common patterns
-        patterns = [
-            "*.log",
-            "*.log.*",
-            "sonar.log*",
-            "*.log.gz",
-            "*.log.bz2"
-        ]
-        
-        for pattern in patterns:
-            log_files.extend(self._log_dir.glob(pattern))
-        
-        # Remove duplicates and filter out directories
-        unique_files = []
-        seen = set()
-        for file_path in log_files:
-            if file_path.is_file() and file_path not in seen:
-                unique_files.append(file_path)
-                seen.add(file_path)
-        
-        return unique_files
+        # Single directory pass; DirEntry caches the name and file type, so
+        # Path objects are only built for the entries we actually return.
+        # The name test covers "*.log", "*.log.*" (incl. .gz/.bz2) and "sonar.log*".
+        with os.scandir(self._log_dir) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if (entry.name.endswith('.log')
+                    or '.log.' in entry.name
+                    or entry.name.startswith(_ACTIVE_LOG_NAME))
+                and entry.is_file()
+            ]
     
     def _compress_old_files(self, log_files: List[Path]) -> int:
         """
@@ -476,6 +510,7 @@ class SonarLoggerConfig:
         
         # Calculate compression cutoff time
         compression_cutoff = time.time() - (self._compression_age_days * 24 * 60 * 60)
+        active_identity = _get_active_log_identity(self._log_dir) if self._log_dir else None
         
         for log_file in log_files:
             try:
@@ -483,12 +518,13 @@ class SonarLoggerConfig:
                 if log_file.suffix in ['.gz', '.bz2', '.xz']:
                     continue
                 
-                # Skip the current active log file (usually the largest/newest)
-                if log_file.name == 'sonar.log':
+                # Skip the current active log file (matched by inode, as in compress_all_logs)
+                file_stat = log_file.stat()
+                if (file_stat.st_dev, file_stat.st_ino) == active_identity:
                     continue
                 
                 # Check if file is old enough for compression
-                if log_file.stat().st_mtime < compression_cutoff:
+                if file_stat.st_mtime < compression_cutoff:
                     if self._compress_file(log_file):
                         files_compressed += 1
                         logger.debug(f"Compressed log file: {log_file.name}")
@@ -572,9 +608,11 @@ class SonarLoggerConfig:
             
             # Decompress file
             if compressed_file.suffix == '.gz':
+                # Reason: the gzip stream has no real fd, so copy_file_range/sendfile
+                # cannot be used; large fixed-size chunks avoid per-line iteration.
                 with gzip.open(compressed_file, 'rb') as f_in:
                     with open(output_file, 'wb') as f_out:
-                        f_out.writelines(f_in)
+                        shutil.copyfileobj(f_in, f_out, _COPY_BUFFER_SIZE)
             else:
                 # Not a compressed file we can handle
                 return False
@@ -690,6 +728,10 @@ class SonarLoggerConfig:
 # Global logger configuration instance
 _logger_config = None
 
+# Upper bounds (inclusive, in days) and labels for the cleanup statistics age histogram
+_AGE_BUCKET_BOUNDS_DAYS = (1.0, 7.0, 30.0)
+_AGE_BUCKET_LABELS = ('0-1_days', '1-7_days', '7-30_days', '30+_days')
+
 def _get_global_config():
     """Get the global logger configuration instance."""
     global _logger_config
@@ -698,6 +740,23 @@ def _get_global_config():
     return _logger_config
 
 
+def _get_active_log_identity(log_dir: Path) -> Optional[tuple]:
+    """
+    Get the (st_dev, st_ino) identity of the active log file.
+    
+    Args:
+        log_dir: Directory containing the active log file
+        
+    Returns:
+        Device/inode pair, or None if there is no active log file
+    """
+    try:
+        active_stat = os.stat(log_dir / _ACTIVE_LOG_NAME)
+    except OSError:
+        return None
+    return (active_stat.st_dev, active_stat.st_ino)
+
+
 def configure_logging(
     log_level: str = 'INFO',
     log_to_file: bool = False,
@@ -792,6 +851,11 @@ def remove_file_logging() -> None:
     _get_global_config().remove_file_logging()
 
 
+def flush_logs() -> None:
+    """Write any buffered log records to the log file."""
+    _get_global_config().flush()
+
+
 def get_log_directory() -> Optional[Path]:
     """Get the current log directory."""
     return _get_global_config().get_log_directory()
@@ -938,14 +1002,16 @@ def compress_all_logs() -> dict:
     
     files_compressed = 0
     size_saved = 0
+    active_identity = _get_active_log_identity(config._log_dir)
     
     for log_file in uncompressed_files:
         try:
-            # Skip active log file
-            if log_file.name == 'sonar.log':
+            # Skip active log file (matched by inode so a rotation in progress is still caught)
+            file_stat = log_file.stat()
+            if (file_stat.st_dev, file_stat.st_ino) == active_identity:
                 continue
             
-            original_size = log_file.stat().st_size
+            original_size = file_stat.st_size
             if config._compress_file(log_file):
                 files_compressed += 1
                 # Estimate compression savings (gzip typically achieves 60-80% compression)
@@ -987,12 +1053,7 @@ def get_cleanup_statistics() -> dict:
     oldest_file_age = 0
     newest_file_age = float('inf')
     
-    age_buckets = {
-        '0-1_days': 0,
-        '1-7_days': 0,
-        '7-30_days': 0,
-        '30+_days': 0
-    }
+    bucket_counts = [0] * len(_AGE_BUCKET_LABELS)
     
     for log_file in log_files:
         try:
@@ -1002,15 +1063,8 @@ def get_cleanup_statistics() -> dict:
             
             total_size += file_size
             
-            # Track age ranges
-            if file_age_days <= 1:
-                age_buckets['0-1_days'] += 1
-            elif file_age_days <= 7:
-                age_buckets['1-7_days'] += 1
-            elif file_age_days <= 30:
-                age_buckets['7-30_days'] += 1
-            else:
-                age_buckets['30+_days'] += 1
+            # Track age ranges (bisect_left keeps the upper bounds inclusive)
+            bucket_counts[bisect.bisect_left(_AGE_BUCKET_BOUNDS_DAYS, file_age_days)] += 1
             
             # Track oldest/newest
             oldest_file_age = max(oldest_file_age, file_age_days)
@@ -1027,6 +1081,8 @@ def get_cleanup_statistics() -> dict:
         except Exception:
             continue
     
+    age_buckets = dict(zip(_AGE_BUCKET_LABELS, bucket_counts))
+    
     return {
         'total_files': len(log_files),
         'total_size': total_size,
@@ -1058,14 +1114,16 @@ def emergency_cleanup() -> dict:
     log_files = config._get_log_files()
     files_removed = 0
     size_freed = 0
+    active_identity = _get_active_log_identity(config._log_dir)
     
     for log_file in log_files:
         try:
-            # Keep the current active log file
-            if log_file.name == 'sonar.log':
+            # Keep the current active log file (matched by inode, not by name)
+            file_stat = log_file.stat()
+            if (file_stat.st_dev, file_stat.st_ino) == active_identity:
                 continue
             
-            file_size = log_file.stat().st_size
+            file_size = file_stat.st_size
             log_file.unlink()
             files_removed += 1
             size_freed += file_size
@@ -1075,7 +1133,7 @@ def emergency_cleanup() -> dict:
     return {
         'files_removed': files_removed,
         'size_freed': size_freed,
-        'files_kept': 1 if (config._log_dir / 'sonar.log').exists() else 0
+        'files_kept': 1 if active_identity is not None else 0
     }
 
 
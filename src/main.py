@@ -2,6 +2,7 @@
 Main application module for Sonar.
 """
 
+import asyncio
 import logging
 import sys
 import os
@@ -13,6 +14,7 @@ gi.require_version("Adw", "1")
 
 # GTK imports must come after gi.require_version
 from gi.repository import Adw, Gio, Gtk  # noqa: E402
+from gi.events import GLibEventLoopPolicy  # noqa: E402
 
 # Load resources immediately before any other imports
 def _load_resources():
@@ -72,8 +74,9 @@ class SonarApplication(Adw.Application):
 
 
 
-        # Core components
-        self.storage = RequestStorage()
+        # Core components; history writes within half a second are coalesced
+        self.storage = RequestStorage(save_delay_ms=500)
+        self.storage.preload_history()  # Parse history while the UI starts
         self.server = WebhookServer(self.storage)
         self.tunnel_manager = TunnelManager()
 
@@ -166,15 +169,20 @@ class SonarApplication(Adw.Application):
         """Handle application shutdown."""
         logger.info("Shutting down application...")
 
-        # Save any active requests to history before shutdown
-        if self.window and hasattr(self.window, 'request_rows') and self.window.request_rows:
+        # Save any active requests to history before shutdown; usually the
+        # window's close handler has already moved them, leaving nothing to do
+        active_count = self.storage.count()
+        if active_count:
             try:
-                logger.info(f"Moving {len(self.window.request_rows)} active requests to history before shutdown")
+                logger.info(f"Moving {active_count} active requests to history before shutdown")
                 self.storage.clear()  # This moves active requests to history
                 logger.info("Successfully moved active requests to history during shutdown")
             except Exception as e:
                 logger.error(f"Error saving requests to history during shutdown: {e}")
 
+        # Write history changes still waiting for the save delay
+        self.storage.flush()
+
         # Stop server and tunnel
         try:
             self.server.stop()
@@ -282,6 +290,8 @@ class SonarApplication(Adw.Application):
 def main() -> int:
     """Main entry point."""
     try:
+        # Run asyncio on top of the GLib main loop so UI code can await background work
+        asyncio.set_event_loop_policy(GLibEventLoopPolicy())
         app = SonarApplication()
         exit_code = app.run(sys.argv)
         return exit_code
@@ -2,7 +2,11 @@
 Main window implementation for Sonar.
 """
 
+import asyncio
+import itertools
+import os
 import threading
+from collections import deque
 
 import gi
 
@@ -14,7 +18,7 @@ gi.require_version("Gio", "2.0")
 from gi.repository import Adw, Gdk, GLib, Gtk, Gio  # noqa: E402
 
 from .models import RequestStorage, TunnelStatus, WebhookRequest  # noqa: E402
-from .request_row import RequestRow  # noqa: E402
+from .request_row import RequestItem, RequestRow  # noqa: E402
 from .server import WebhookServer  # noqa: E402
 from .tunnel import TunnelManager  # noqa: E402
 from .error_handler import process_error, ErrorCategory  # noqa: E402
@@ -23,6 +27,18 @@ from .logging_config import get_logger  # noqa: E402
 
 logger = get_logger(__name__)
 
+# Sentinel marking the auth token cache as not yet loaded
+_UNSET = object()
+
+# Entries of the history method filter dropdown; index 0 disables the filter
+_METHOD_FILTER_OPTIONS = ("All Methods", "GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS")
+
+# History row buttons: (action name, icon name, tooltip, extra CSS class)
+_HISTORY_ROW_ACTIONS = (
+    ("history.restore", "edit-undo-symbolic", "Restore to active requests", None),
+    ("history.delete", "edit-delete-symbolic", "Delete permanently", "destructive-action"),
+)
+
 
 @Gtk.Template(resource_path="/io/github/tobagin/sonar/ui/main_window.ui")
 class SonarWindow(Adw.ApplicationWindow):
@@ -30,6 +46,19 @@ class SonarWindow(Adw.ApplicationWindow):
 
     __gtype_name__ = "SonarWindow"
 
+    # Number of history items shown immediately when the history opens, and
+    # appended per idle main loop iteration afterwards
+    HISTORY_FIRST_CHUNK_SIZE = 100
+    HISTORY_CHUNK_SIZE = 250
+
+    # Maximum number of queued requests shown per main loop iteration
+    REQUEST_BATCH_SIZE = 20
+
+    # Quiet period after the last filter change before the history is refiltered (ms);
+    # keyboard navigation of the method dropdown settles faster than typing
+    SEARCH_DEBOUNCE_MS = 150
+    METHOD_FILTER_DEBOUNCE_MS = 50
+
     # Template children
     toast_overlay: Adw.ToastOverlay = Gtk.Template.Child()
     header_bar: Adw.HeaderBar = Gtk.Template.Child()
@@ -84,16 +113,28 @@ class SonarWindow(Adw.ApplicationWindow):
         self.tunnel_active = False
         self.server_port = 8000
         self.has_received_webhooks = False
-        self.request_rows = []  # Track all request rows for accordion behavior
-        self.history_rows = []  # Track all history rows for accordion behavior
-        self.filtered_history_rows = []  # Track filtered history rows
+        self._expanded_row = None  # Currently expanded request row (accordion behavior)
+        self.request_store = Gio.ListStore.new(RequestItem)  # Model backing request_list
+        self.history_store = Gio.ListStore.new(RequestItem)  # Model backing history_list
         self._tunnel_loading = False  # Track tunnel operation state
         self._clear_loading = False  # Track clear operation state
         self._current_search_query = ""  # Current search query
         self._current_method_filter = None  # Current method filter
+        self._background_tasks = set()  # Keep running asyncio tasks alive
+        self._auth_token_cache = _UNSET  # Cached ngrok auth token lookup
+        self._history_loader_source = 0  # Idle source streaming history items into the list
+        self._history_item_by_id = {}  # Request id -> item currently in history_store
+        self._filter_debounce_source = 0  # Pending timeout applying the history filters
+        self._applied_history_filter = ("", None)  # (query, method) the history rows reflect
+        self._history_filter_query = ""  # Applied query, lowercased for the filter function
+        self._history_filter_method = None  # Applied method, uppercased for the filter function
+        self._pending_requests = deque()  # Requests received but not yet shown
+        self._pending_lock = threading.Lock()  # Guards the queue and flush flag
+        self._flush_scheduled = False  # Whether an idle flush of the queue is pending
 
         # Set up UI
         self._setup_ui()
+        self._setup_actions()
         self._setup_signals()
 
         # Set up server callback
@@ -126,11 +167,11 @@ class SonarWindow(Adw.ApplicationWindow):
         # Disable start button during loading
         self.start_tunnel_button.set_sensitive(not loading)
         
-        # Update button text based on loading state
-        if loading:
-            self.start_tunnel_button.set_label("Starting...")
-        else:
-            self.start_tunnel_button.set_label("Start Tunnel")
+        # Update button text based on loading state; only write a new label
+        # because GtkButton emits notify::label even for an identical string
+        label = "Starting..." if loading else "Start Tunnel"
+        if self.start_tunnel_button.get_label() != label:
+            self.start_tunnel_button.set_label(label)
         
 
     def _set_clear_loading(self, loading: bool) -> None:
@@ -149,7 +190,8 @@ class SonarWindow(Adw.ApplicationWindow):
 
     def _setup_ui(self) -> None:
         """Set up the UI elements."""
-        # Configure the list box
+        # Configure the list box; rows are created from the model on insertion
+        self.request_list.bind_model(self.request_store, self._create_request_row)
         self.request_list.set_placeholder(
             Gtk.Label(label="No requests received yet", margin_top=50, margin_bottom=50)
         )
@@ -166,7 +208,12 @@ class SonarWindow(Adw.ApplicationWindow):
         # Set up URL label
         self.url_label.set_text("Click 'Start Tunnel' to begin receiving webhooks")
 
-        # Configure history list
+        # Search changes are debounced by the window, not by the entry itself
+        self.history_search_entry.set_search_delay(0)
+
+        # Configure history list; filtering hides rows instead of rebuilding them
+        self.history_list.bind_model(self.history_store, self._create_history_row)
+        self.history_list.set_filter_func(self._history_filter_func)
         self.history_list.set_placeholder(
             Gtk.Label(label="No requests in history", margin_top=50, margin_bottom=50)
         )
@@ -174,12 +221,32 @@ class SonarWindow(Adw.ApplicationWindow):
         # Set up method filter dropdown
         self._setup_method_filter()
 
-        # Initialize history button visibility
-        self._update_history_button_visibility()
+        # History buttons stay hidden until the history has been read; the
+        # first read is deferred until after the window is presented, so the
+        # background history preload is not waited on while building the UI
+        self.header_history_button.set_visible(False)
+        self.history_button.set_visible(False)
+        GLib.idle_add(self._on_startup_idle)
 
         # Initial stack page
         self.main_stack.set_visible_child_name("empty")
 
+    def _setup_actions(self) -> None:
+        """Set up window-scoped actions used by list rows."""
+        # History row buttons activate these with the request id as target,
+        # so no per-row signal handlers are needed
+        history_actions = Gio.SimpleActionGroup()
+        
+        restore_action = Gio.SimpleAction.new("restore", GLib.VariantType.new("s"))
+        restore_action.connect("activate", self._on_history_restore_action)
+        history_actions.add_action(restore_action)
+        
+        delete_action = Gio.SimpleAction.new("delete", GLib.VariantType.new("s"))
+        delete_action.connect("activate", self._on_history_delete_action)
+        history_actions.add_action(delete_action)
+        
+        self.insert_action_group("history", history_actions)
+
     def _setup_signals(self) -> None:
         """Set up signal connections."""
         # Button signals
@@ -200,6 +267,9 @@ class SonarWindow(Adw.ApplicationWindow):
         self.history_search_entry.connect("search-changed", self._on_search_changed)
         self.history_method_filter.connect("notify::selected", self._on_method_filter_changed)
 
+        # Settings signals
+        self.settings.connect("changed::ngrok-auth-token", self._invalidate_auth_token_cache)
+
         # Window signals
         self.connect("close-request", self._on_close_request)
 
@@ -236,7 +306,9 @@ class SonarWindow(Adw.ApplicationWindow):
         
         if current_page == "history":
             # Currently in history view - go back to requests or empty
-            if self.request_rows:
+            self._cancel_history_loader()
+            self._cancel_filter_debounce()
+            if self.request_store.get_n_items():
                 self.main_stack.set_visible_child_name("requests")
             else:
                 self.main_stack.set_visible_child_name("empty")
@@ -255,7 +327,9 @@ class SonarWindow(Adw.ApplicationWindow):
     def _on_back_to_requests_clicked(self, button: Gtk.Button) -> None:
         """Handle back to requests button click."""
         # Switch back to requests view
-        if self.request_rows:
+        self._cancel_history_loader()
+        self._cancel_filter_debounce()
+        if self.request_store.get_n_items():
             self.main_stack.set_visible_child_name("requests")
         else:
             self.main_stack.set_visible_child_name("empty")
@@ -272,42 +346,73 @@ class SonarWindow(Adw.ApplicationWindow):
         logger.info("Window close request received")
         
         # Save any active requests to history before closing
-        if self.request_rows:
+        active_count = self.storage.count()
+        if active_count:
             try:
-                logger.info(f"Moving {len(self.request_rows)} active requests to history before closing")
+                logger.info("Moving %s active requests to history before closing", active_count)
                 self.storage.clear()  # This moves active requests to history
                 logger.info("Successfully moved active requests to history")
             except Exception as e:
-                logger.error(f"Error saving requests to history: {e}")
+                logger.error("Error saving requests to history: %s", e)
         
         # Stop server and tunnel before closing
         try:
             self.server.stop()
             self.tunnel_manager.stop()
         except Exception as e:
-            logger.error(f"Error stopping services: {e}")
+            logger.error("Error stopping services: %s", e)
 
         logger.info("Window closing allowed")
         return False  # Allow window to close
 
     def _on_request_received(self, request: WebhookRequest) -> None:
         """Handle new webhook request (called from background thread)."""
-        # Use GLib.idle_add to update UI from main thread
-        GLib.idle_add(self._add_request_to_list, request)
+        # Queue the request; only the first arrival of a burst schedules a
+        # main loop callback, later ones are picked up by that same flush
+        with self._pending_lock:
+            self._pending_requests.append(request)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        GLib.idle_add(self._flush_pending_requests)
+
+    def _flush_pending_requests(self) -> bool:
+        """Show the next batch of queued requests (idle callback on the main thread).
+        
+        Returns:
+            bool: True while requests remain queued, False once the queue is empty.
+        """
+        with self._pending_lock:
+            batch_size = min(len(self._pending_requests), self.REQUEST_BATCH_SIZE)
+            requests = [self._pending_requests.popleft() for _ in range(batch_size)]
+            more_pending = bool(self._pending_requests)
+            if not more_pending:
+                self._flush_scheduled = False
+        
+        if requests:
+            self._add_requests_to_list(requests)
+        return GLib.SOURCE_CONTINUE if more_pending else GLib.SOURCE_REMOVE
 
-    def _add_request_to_list(self, request: WebhookRequest) -> None:
-        """Add a request to the list (called from main thread)."""
-        # Create request row
-        row = RequestRow(request)
+    def _create_request_row(self, item: RequestItem) -> RequestRow:
+        """Create the row widget for an item of the request model."""
+        row = RequestRow(item.request)
 
         # Connect to expansion signal for accordion behavior
         row.connect("notify::expanded", self._on_row_expanded)
+        return row
 
-        # Add to tracking list and UI list
-        self.request_rows.insert(0, row)  # Insert at beginning to match prepend
-        self.request_list.prepend(row)
+    def _add_requests_to_list(self, requests: list[WebhookRequest]) -> None:
+        """Add a batch of requests to the list (called from main thread).
+        
+        Args:
+            requests (list[WebhookRequest]): Requests in arrival order.
+        """
+        # Insert newest first in one model update; the bound list box creates
+        # the rows synchronously
+        self.request_store.splice(0, 0, [RequestItem(request) for request in reversed(requests)])
+        row = self.request_list.get_row_at_index(0)
 
-        # Expand the new row and close all others
+        # Expand the newest row and close all others
         self._expand_single_row(row)
 
         # Switch to requests view if needed
@@ -319,9 +424,13 @@ class SonarWindow(Adw.ApplicationWindow):
             self.has_received_webhooks = True
             self._update_banner_visibility()
 
-        # Show toast for new request (brief notification)
-        self._show_toast(f"New {request.method} request received", timeout=1)
-        logger.info(f"Added request to list: {request.method} {request.path}")
+        # Show one brief notification per batch
+        if len(requests) == 1:
+            self._show_toast(f"New {requests[0].method} request received", timeout=1)
+        else:
+            self._show_toast(f"{len(requests)} new requests received", timeout=1)
+        for request in requests:
+            logger.info("Added request to list: %s %s", request.method, request.path)
         
         # Update button state in case we switched from empty to requests view
         self._update_history_button_state()
@@ -345,21 +454,32 @@ class SonarWindow(Adw.ApplicationWindow):
     def _on_row_expanded(self, row: RequestRow, pspec) -> None:
         """Handle row expansion for accordion behavior."""
         if row.get_expanded():
-            # This row was expanded, close all others
+            # This row was expanded, close the previously expanded one
             self._expand_single_row(row)
+        elif row is self._expanded_row:
+            self._expanded_row = None
 
     def _expand_single_row(self, target_row: RequestRow) -> None:
-        """Expand a single row and close all others."""
-        for row in self.request_rows:
-            if row == target_row:
-                row.set_expanded(True)
-            else:
-                row.set_expanded(False)
-
-    def _update_ui_state(self) -> None:
-        """Update UI state based on tunnel status with improved error handling."""
-        # Check auth token availability first (don't rely on cached tunnel status)
-        import os
+        """Expand a single row and close the previously expanded one."""
+        previous_row = self._expanded_row
+        # Reason: update the tracked row first so the notify::expanded handlers
+        # triggered by the calls below see the new state and return immediately
+        self._expanded_row = target_row
+        
+        if previous_row is not None and previous_row is not target_row:
+            previous_row.set_expanded(False)
+        if not target_row.get_expanded():
+            target_row.set_expanded(True)
+
+    def _get_auth_token(self) -> str | None:
+        """Get the ngrok auth token, reading the environment/GSettings only on a cache miss.
+        
+        Returns:
+            str | None: The auth token, or None if none is configured.
+        """
+        if self._auth_token_cache is not _UNSET:
+            return self._auth_token_cache
+        
         auth_token = os.getenv("NGROK_AUTHTOKEN")
         if not auth_token:
             # Try loading from GSettings
@@ -370,73 +490,97 @@ class SonarWindow(Adw.ApplicationWindow):
             except Exception:
                 pass
         
-        # Hide all buttons first
-        self.setup_token_button.set_visible(False)
-        self.start_tunnel_container.set_visible(False)
-        self.copy_url_button.set_visible(False)
-        self.stop_tunnel_button.set_visible(False)
-        
-        # If no auth token, show setup button
-        if not auth_token:
-            self.setup_token_button.set_visible(True)
-            self.url_label.set_text("Setup required: Click 'Setup Ngrok Token' to get started")
-            self.tunnel_active = False
-            self._update_banner_visibility()
-            return
+        self._auth_token_cache = auth_token or None
+        return self._auth_token_cache
+
+    def _invalidate_auth_token_cache(self, *args) -> None:
+        """Force the next auth token lookup to re-read the environment/GSettings."""
+        self._auth_token_cache = _UNSET
+
+    def _update_ui_state(self) -> None:
+        """Update UI state based on tunnel status with improved error handling."""
+        # Check auth token availability first (don't rely on cached tunnel status)
+        auth_token = self._get_auth_token()
         
-        # Get tunnel status for further decisions
-        status = self.tunnel_manager.get_status()
+        # Work out the target state first, then apply it, so each widget is
+        # written once instead of being hidden and immediately shown again
+        show_setup = show_start = show_active = False
         
-        # Check if tunnel is unavailable (ngrok not available or other errors)
-        if status.error and "not available" in status.error.lower():
-            # Ngrok not available - show user-friendly message
-            self.url_label.set_text("Ngrok is required but not available. Please install ngrok to continue.")
+        if not auth_token:
+            # No auth token - show setup button
+            show_setup = True
+            url_text = "Setup required: Click 'Setup Ngrok Token' to get started"
             self.tunnel_active = False
-        elif status.active and status.public_url:
-            # Tunnel is active - show copy + stop buttons
-            self.copy_url_button.set_visible(True)
-            self.stop_tunnel_button.set_visible(True)
-            self.url_label.set_text(status.public_url)
-            self.tunnel_active = True
         else:
-            # Tunnel is inactive but auth token is available - show start button
-            self.start_tunnel_container.set_visible(True)
-            if status.error and "token" not in status.error.lower():
-                # Show specific error if not token-related
-                error_msg = status.error[:100] + "..." if len(status.error) > 100 else status.error
-                self.url_label.set_text(f"Error: {error_msg}")
+            # Get tunnel status for further decisions
+            status = self.tunnel_manager.get_status()
+            
+            # Check if tunnel is unavailable (ngrok not available or other errors)
+            if status.error and "not available" in status.error.lower():
+                # Ngrok not available - show user-friendly message
+                url_text = "Ngrok is required but not available. Please install ngrok to continue."
+                self.tunnel_active = False
+            elif status.active and status.public_url:
+                # Tunnel is active - show copy + stop buttons
+                show_active = True
+                url_text = status.public_url
+                self.tunnel_active = True
             else:
-                self.url_label.set_text("Click 'Start Tunnel' to begin receiving webhooks")
-            self.tunnel_active = False
+                # Tunnel is inactive but auth token is available - show start button
+                show_start = True
+                if status.error and "token" not in status.error.lower():
+                    # Show specific error if not token-related
+                    error_msg = status.error[:100] + "..." if len(status.error) > 100 else status.error
+                    url_text = f"Error: {error_msg}"
+                else:
+                    url_text = "Click 'Start Tunnel' to begin receiving webhooks"
+                self.tunnel_active = False
+        
+        # GTK skips visibility/text writes that do not change the value
+        self.setup_token_button.set_visible(show_setup)
+        self.start_tunnel_container.set_visible(show_start)
+        self.copy_url_button.set_visible(show_active)
+        self.stop_tunnel_button.set_visible(show_active)
+        self.url_label.set_text(url_text)
         
         # Update banner visibility based on webhook history
         self._update_banner_visibility()
 
 
+    def _run_async(self, coro) -> None:
+        """Schedule a coroutine on the GLib-integrated asyncio event loop.
+        
+        Args:
+            coro: The coroutine to run.
+        """
+        task = asyncio.ensure_future(coro)
+        # Reason: the event loop only keeps weak references to tasks
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     def _start_tunnel(self) -> None:
-        """Start the tunnel in a background thread with improved error handling."""
+        """Start the tunnel without blocking the UI, with improved error handling."""
         # Set loading state immediately
         self._set_tunnel_loading(True)
-        
-        def start_services():
-            try:
-                # Start server first
-                self.server.start(port=self.server_port)
+        self._run_async(self._start_tunnel_async())
 
-                # Start tunnel
-                status = self.tunnel_manager.start(port=self.server_port)
+    async def _start_tunnel_async(self) -> None:
+        """Start the server and tunnel, offloading the blocking calls to worker threads."""
+        try:
+            # Start server first
+            await asyncio.to_thread(self.server.start, port=self.server_port)
 
-                # Update UI from main thread
-                GLib.idle_add(self._tunnel_start_completed, status)
+            # Start tunnel
+            status = await asyncio.to_thread(self.tunnel_manager.start, port=self.server_port)
 
-            except Exception as e:
-                logger.error(f"Error starting services: {e}")
-                user_error = process_error(str(e), "starting services")
-                GLib.idle_add(self._tunnel_start_failed, user_error)
+        except Exception as e:
+            logger.error("Error starting services: %s", e)
+            user_error = process_error(str(e), "starting services")
+            self._tunnel_start_failed(user_error)
+            return
 
-        # Start in background thread
-        thread = threading.Thread(target=start_services, daemon=True)
-        thread.start()
+        # Coroutine resumes on the main loop, so the UI can be updated directly
+        self._tunnel_start_completed(status)
 
     def _tunnel_start_completed(self, status) -> None:
         """Handle tunnel start completion (called from main thread)."""
@@ -447,10 +591,10 @@ class SonarWindow(Adw.ApplicationWindow):
         self._update_ui_state()
         
         if status.active:
-            logger.info(f"Services started successfully: {status.public_url}")
+            logger.info("Services started successfully: %s", status.public_url)
             self._show_toast("Tunnel started successfully", 3)
         else:
-            logger.error(f"Failed to start tunnel: {status.error}")
+            logger.error("Failed to start tunnel: %s", status.error)
             # Show user-friendly error dialog
             if status.error:
                 user_error = process_error(status.error, "starting tunnel")
@@ -480,29 +624,27 @@ class SonarWindow(Adw.ApplicationWindow):
         show_error_dialog(self, user_error, on_action_callback)
 
     def _stop_tunnel(self) -> None:
-        """Stop the tunnel in a background thread."""
+        """Stop the tunnel without blocking the UI."""
         # Disable stop button during operation
         self.stop_tunnel_button.set_sensitive(False)
         self.header_stop_button.set_sensitive(False)
-        
-        def stop_services():
-            try:
-                # Stop tunnel
-                self.tunnel_manager.stop()
+        self._run_async(self._stop_tunnel_async())
 
-                # Stop server
-                self.server.stop()
+    async def _stop_tunnel_async(self) -> None:
+        """Stop the tunnel and server, offloading the blocking calls to worker threads."""
+        try:
+            # Stop tunnel
+            await asyncio.to_thread(self.tunnel_manager.stop)
 
-                # Update UI from main thread
-                GLib.idle_add(self._tunnel_stop_completed)
+            # Stop server
+            await asyncio.to_thread(self.server.stop)
 
-            except Exception as e:
-                logger.error(f"Error stopping services: {e}")
-                GLib.idle_add(self._tunnel_stop_failed)
+        except Exception as e:
+            logger.error("Error stopping services: %s", e)
+            self._tunnel_stop_failed()
+            return
 
-        # Stop in background thread
-        thread = threading.Thread(target=stop_services, daemon=True)
-        thread.start()
+        self._tunnel_stop_completed()
 
     def _tunnel_stop_completed(self) -> None:
         """Handle tunnel stop completion (called from main thread)."""
@@ -534,37 +676,27 @@ class SonarWindow(Adw.ApplicationWindow):
         """Clear all requests from the list."""
         # Set loading state
         self._set_clear_loading(True)
-        
-        def clear_operation():
-            try:
-                # Clear storage
-                self.storage.clear()
+        self._run_async(self._clear_requests_async())
 
-                # Update UI from main thread
-                GLib.idle_add(self._clear_requests_completed)
-                
-            except Exception as e:
-                logger.error(f"Error clearing requests: {e}")
-                GLib.idle_add(self._clear_requests_failed)
+    async def _clear_requests_async(self) -> None:
+        """Clear storage off the main thread to prevent UI blocking."""
+        try:
+            await asyncio.to_thread(self.storage.clear)
+        except Exception as e:
+            logger.error("Error clearing requests: %s", e)
+            self._clear_requests_failed()
+            return
 
-        # Run in background thread to prevent UI blocking
-        thread = threading.Thread(target=clear_operation, daemon=True)
-        thread.start()
+        self._clear_requests_completed()
 
     def _clear_requests_completed(self) -> None:
         """Handle clear requests completion (called from main thread)."""
         # Clear loading state
         self._set_clear_loading(False)
         
-        # Clear tracking list
-        self.request_rows.clear()
-
-        # Clear UI list
-        while True:
-            row = self.request_list.get_first_child()
-            if row is None:
-                break
-            self.request_list.remove(row)
+        # Clear the model (a single items-changed emission)
+        self._expanded_row = None
+        self.request_store.remove_all()
 
         # Reset webhook flag and hide banner/header button
         self.has_received_webhooks = False
@@ -595,10 +727,16 @@ class SonarWindow(Adw.ApplicationWindow):
         self._clear_history_list()
         self._current_search_query = ""
         self._current_method_filter = None
+        self._applied_history_filter = ("", None)
+        self._history_filter_query = ""
+        self._history_filter_method = None
         
         # Reset search entry and filter dropdown
         self.history_search_entry.set_text("")
         self.history_method_filter.set_selected(0)
+        # Reason: the resets above queue a debounced refilter that would only
+        # repeat the load below
+        self._cancel_filter_debounce()
         
         # Get history from storage
         history_requests = self.storage.get_history()
@@ -606,60 +744,114 @@ class SonarWindow(Adw.ApplicationWindow):
         if not history_requests:
             return
         
-        # Add history rows
-        for request in history_requests:
-            row = self._create_history_row(request)
-            self.history_rows.append(row)
-            self.history_list.append(row)
+        self._populate_history(history_requests)
 
-    def _create_history_row(self, request):
-        """Create a history row with restore/delete buttons."""
-        from .request_row import RequestRow
+    def _populate_history(self, requests: list[WebhookRequest]) -> None:
+        """Replace the history list contents, streaming large lists in chunks.
         
-        # Create a modified request row for history
-        row = RequestRow(request)
+        The first chunk is shown immediately; the rest is appended from an idle
+        callback so the window stays responsive while long histories load.
         
-        # Add restore and delete buttons to the row
-        restore_button = Gtk.Button(
-            icon_name="edit-undo-symbolic",
-            tooltip_text="Restore to active requests"
-        )
-        restore_button.add_css_class("flat")
-        restore_button.connect("clicked", lambda btn, req_id=request.id: self._restore_from_history(req_id))
+        Args:
+            requests (list[WebhookRequest]): Requests to show, in display order.
+        """
+        self._cancel_history_loader()
+        self._history_item_by_id.clear()
         
-        delete_button = Gtk.Button(
-            icon_name="edit-delete-symbolic", 
-            tooltip_text="Delete permanently"
-        )
-        delete_button.add_css_class("flat")
-        delete_button.add_css_class("destructive-action")
-        delete_button.connect("clicked", lambda btn, req_id=request.id: self._delete_from_history(req_id))
+        pending = iter(requests)
+        first_chunk = self._create_history_items(pending, self.HISTORY_FIRST_CHUNK_SIZE)
+        self.history_store.splice(0, self.history_store.get_n_items(), first_chunk)
         
-        # Add buttons to the row's action area (we'll need to modify RequestRow for this)
-        button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
-        button_box.append(restore_button)
-        button_box.append(delete_button)
+        if len(first_chunk) == self.HISTORY_FIRST_CHUNK_SIZE:
+            self._history_loader_source = GLib.idle_add(
+                self._append_history_chunk, pending, priority=GLib.PRIORITY_DEFAULT_IDLE
+            )
+
+    def _append_history_chunk(self, pending) -> bool:
+        """Append the next chunk of pending history items (idle callback).
+        
+        Args:
+            pending: Iterator over the remaining requests.
+            
+        Returns:
+            bool: True while more items remain, False once exhausted.
+        """
+        chunk = self._create_history_items(pending, self.HISTORY_CHUNK_SIZE)
+        if chunk:
+            self.history_store.splice(self.history_store.get_n_items(), 0, chunk)
+        
+        if len(chunk) < self.HISTORY_CHUNK_SIZE:
+            self._history_loader_source = 0
+            return GLib.SOURCE_REMOVE
+        return GLib.SOURCE_CONTINUE
+
+    def _create_history_items(self, pending, count: int) -> list[RequestItem]:
+        """Create model items for the next chunk of history and index them by id.
+        
+        Args:
+            pending: Iterator over the remaining requests.
+            count (int): Maximum number of items to create.
+            
+        Returns:
+            list[RequestItem]: Up to count new items.
+        """
+        items = [RequestItem(request) for request in itertools.islice(pending, count)]
+        for item in items:
+            self._history_item_by_id[item.request.id] = item
+        return items
+
+    def _remove_history_item(self, request_id: str) -> None:
+        """Remove a request from the history list, if it is shown."""
+        item = self._history_item_by_id.pop(request_id, None)
+        if item is None:
+            return
+        # Identity lookup runs in C, without touching Python item attributes
+        found, position = self.history_store.find(item)
+        if found:
+            self.history_store.remove(position)
+
+    def _cancel_history_loader(self) -> None:
+        """Stop streaming pending history items into the list."""
+        if self._history_loader_source:
+            GLib.source_remove(self._history_loader_source)
+            self._history_loader_source = 0
+
+    def _create_history_row(self, item: RequestItem) -> RequestRow:
+        """Create the row widget for an item of the history model, with restore/delete buttons."""
+        row = RequestRow(item.request)
+        target = GLib.Variant.new_string(item.request.id)
+        
+        for action_name, icon_name, tooltip, css_class in _HISTORY_ROW_ACTIONS:
+            button = Gtk.Button(
+                icon_name=icon_name,
+                tooltip_text=tooltip,
+                valign=Gtk.Align.CENTER,
+                action_name=action_name,
+                action_target=target
+            )
+            button.add_css_class("flat")
+            if css_class:
+                button.add_css_class(css_class)
+            row.add_suffix(button)
         
-        # For now, just return the basic row - we can enhance this later
         return row
 
+    def _on_history_restore_action(self, action: Gio.SimpleAction, parameter: GLib.Variant) -> None:
+        """Handle the history.restore action for the request id in parameter."""
+        self._restore_from_history(parameter.get_string())
+
+    def _on_history_delete_action(self, action: Gio.SimpleAction, parameter: GLib.Variant) -> None:
+        """Handle the history.delete action for the request id in parameter."""
+        self._delete_from_history(parameter.get_string())
+
     def _restore_from_history(self, request_id: str) -> None:
         """Restore a request from history to active requests."""
         if self.storage.restore_from_history(request_id):
-            # Find and remove the row from both lists
-            for i, row in enumerate(self.history_rows):
-                if row.get_request().id == request_id:
-                    self.history_list.remove(row)
-                    del self.history_rows[i]
-                    break
+            # Remove the item from the history list
+            self._remove_history_item(request_id)
             
-            for i, row in enumerate(self.filtered_history_rows):
-                if row.get_request().id == request_id:
-                    del self.filtered_history_rows[i]
-                    break
-            
-            # Refresh the requests view to show the restored request
-            self._refresh_requests_view()
+            # Show the restored request in the requests list
+            self._add_restored_request_to_list(request_id)
             
             # Show success toast
             self._show_toast("Request restored to active requests", timeout=2)
@@ -670,17 +862,8 @@ class SonarWindow(Adw.ApplicationWindow):
     def _delete_from_history(self, request_id: str) -> None:
         """Permanently delete a request from history."""
         if self.storage.remove_from_history(request_id):
-            # Find and remove the row from both lists
-            for i, row in enumerate(self.history_rows):
-                if row.get_request().id == request_id:
-                    self.history_list.remove(row)
-                    del self.history_rows[i]
-                    break
-            
-            for i, row in enumerate(self.filtered_history_rows):
-                if row.get_request().id == request_id:
-                    del self.filtered_history_rows[i]
-                    break
+            # Remove the item from the history list
+            self._remove_history_item(request_id)
             
             # Show success toast
             self._show_toast("Request deleted permanently", timeout=2)
@@ -697,26 +880,37 @@ class SonarWindow(Adw.ApplicationWindow):
 
     def _clear_history_list(self) -> None:
         """Clear the history list UI."""
-        self.history_rows.clear()
-        self.filtered_history_rows.clear()
-        while True:
-            row = self.history_list.get_first_child()
-            if row is None:
-                break
-            self.history_list.remove(row)
-
-    def _refresh_requests_view(self) -> None:
-        """Refresh the requests view to show any restored requests."""
-        # This is a simple refresh - we could optimize this later
-        pass
+        self._cancel_history_loader()
+        self._history_item_by_id.clear()
+        self.history_store.remove_all()
+
+    def _add_restored_request_to_list(self, request_id: str) -> None:
+        """Insert a request restored from history at the top of the requests list."""
+        request = self.storage.get_request_by_id(request_id)
+        if request is None:
+            return
+        
+        self.request_store.insert(0, RequestItem(request))
+        
+        # Expand the restored row and close the previously expanded one
+        self._expand_single_row(self.request_list.get_row_at_index(0))
+
+    def _on_startup_idle(self) -> bool:
+        """Show the history buttons once the first frame is up (idle callback).
+        
+        Returns:
+            bool: Always False, so the callback runs only once.
+        """
+        self._update_history_button_visibility()
+        return GLib.SOURCE_REMOVE
 
     def _update_history_button_visibility(self) -> None:
         """Update history button visibility based on whether there's history."""
-        has_history = self.storage.count_history() > 0
+        has_history = self.storage.has_history
         # Header history button is always visible if there's history
         self.header_history_button.set_visible(has_history)
         # Requests page history button only visible when there's history and active requests
-        self.history_button.set_visible(has_history and len(self.request_rows) > 0)
+        self.history_button.set_visible(has_history and self.request_store.get_n_items() > 0)
         
         # Update button state
         self._update_history_button_state()
@@ -735,18 +929,8 @@ class SonarWindow(Adw.ApplicationWindow):
         
     def _setup_method_filter(self) -> None:
         """Set up the method filter dropdown."""
-        from gi.repository import Gio
-        
-        # Create string list model with common HTTP methods
-        string_list = Gio.ListStore.new(Gtk.StringObject)
-        string_list.append(Gtk.StringObject.new("All Methods"))
-        string_list.append(Gtk.StringObject.new("GET"))
-        string_list.append(Gtk.StringObject.new("POST"))
-        string_list.append(Gtk.StringObject.new("PUT"))
-        string_list.append(Gtk.StringObject.new("PATCH"))
-        string_list.append(Gtk.StringObject.new("DELETE"))
-        string_list.append(Gtk.StringObject.new("HEAD"))
-        string_list.append(Gtk.StringObject.new("OPTIONS"))
+        # Create string list model with common HTTP methods in one call
+        string_list = Gtk.StringList.new(_METHOD_FILTER_OPTIONS)
         
         self.history_method_filter.set_model(string_list)
         self.history_method_filter.set_selected(0)  # Default to "All Methods"
@@ -760,9 +944,36 @@ class SonarWindow(Adw.ApplicationWindow):
         self._show_export_dialog()
         
     def _on_search_changed(self, search_entry: Gtk.SearchEntry) -> None:
-        """Handle search entry text changes."""
+        """Handle search entry text changes, coalescing bursts of keystrokes."""
         self._current_search_query = search_entry.get_text()
+        
+        self._schedule_history_filter(self.SEARCH_DEBOUNCE_MS)
+    
+    def _schedule_history_filter(self, delay_ms: int) -> None:
+        """Refilter the history once filter changes have paused for delay_ms.
+        
+        Args:
+            delay_ms (int): Quiet period in milliseconds.
+        """
+        # Restart the quiet period so only the last change triggers a refilter
+        self._cancel_filter_debounce()
+        self._filter_debounce_source = GLib.timeout_add(delay_ms, self._apply_history_filter)
+    
+    def _apply_history_filter(self) -> bool:
+        """Refilter the history once filter changes have paused (timeout callback).
+        
+        Returns:
+            bool: Always False, so the timeout runs only once.
+        """
+        self._filter_debounce_source = 0
         self._filter_history()
+        return GLib.SOURCE_REMOVE
+    
+    def _cancel_filter_debounce(self) -> None:
+        """Drop a pending debounced history refilter."""
+        if self._filter_debounce_source:
+            GLib.source_remove(self._filter_debounce_source)
+            self._filter_debounce_source = 0
         
     def _on_method_filter_changed(self, dropdown: Gtk.DropDown, pspec) -> None:
         """Handle method filter dropdown changes."""
@@ -775,24 +986,29 @@ class SonarWindow(Adw.ApplicationWindow):
             string_obj = model.get_item(selected)
             self._current_method_filter = string_obj.get_string()
         
-        self._filter_history()
+        self._schedule_history_filter(self.METHOD_FILTER_DEBOUNCE_MS)
         
     def _filter_history(self) -> None:
         """Filter the history list based on current search and method filter."""
-        # Clear existing filtered results
-        self._clear_history_list()
+        # Nothing to do if the rows already reflect these filters, e.g. when the
+        # dropdown is re-selected or the query is typed back to what it was
+        history_filter = (self._current_search_query, self._current_method_filter)
+        if history_filter == self._applied_history_filter:
+            return
+        self._applied_history_filter = history_filter
         
-        # Get filtered results from storage
-        filtered_requests = self.storage.search_history(
-            query=self._current_search_query,
-            method=self._current_method_filter
-        )
+        # Normalize the filters once here instead of once per row
+        query, method = history_filter
+        self._history_filter_query = query.lower()
+        self._history_filter_method = method.upper() if method else None
         
-        # Add filtered rows to the list
-        for request in filtered_requests:
-            row = self._create_history_row(request)
-            self.filtered_history_rows.append(row)
-            self.history_list.append(row)
+        # Re-run the filter function over the existing rows, toggling their
+        # visibility; no rows are destroyed or recreated
+        self.history_list.invalidate_filter()
+    
+    def _history_filter_func(self, row: RequestRow) -> bool:
+        """Decide whether a history row is shown under the current filters."""
+        return row.request.matches_normalized(self._history_filter_query, self._history_filter_method)
     
     def _show_history_stats_dialog(self) -> None:
         """Show a dialog with history statistics."""
@@ -874,20 +1090,24 @@ class SonarWindow(Adw.ApplicationWindow):
                     else:
                         format_type = 'json'
                     
-                    # Perform export
-                    success = self.storage.export_history(filepath, format_type)
-                    if success:
-                        self._show_toast(f"History exported to {filepath}", timeout=3)
-                    else:
-                        self._show_toast("Failed to export history", timeout=3)
+                    # Perform export off the main thread
+                    self._run_async(self._export_history_async(filepath, format_type))
             except Exception as e:
                 # User cancelled or error occurred
                 if "dismissed" not in str(e).lower():
-                    logger.warning(f"Export dialog error: {e}")
+                    logger.warning("Export dialog error: %s", e)
                     self._show_toast("Export cancelled", timeout=2)
         
         dialog.save(self, None, on_save_finish)
 
+    async def _export_history_async(self, filepath: str, format_type: str) -> None:
+        """Export the history on a worker thread and report the result."""
+        success = await asyncio.to_thread(self.storage.export_history, filepath, format_type)
+        if success:
+            self._show_toast(f"History exported to {filepath}", timeout=3)
+        else:
+            self._show_toast("Failed to export history", timeout=3)
+
     def _show_token_setup_dialog(self) -> None:
         """Show dialog to help user set up ngrok auth token."""
         from .preferences import PreferencesDialog
@@ -908,7 +1128,8 @@ class SonarWindow(Adw.ApplicationWindow):
     
     def _on_preferences_closed(self, dialog) -> None:
         """Handle preferences dialog close."""
-        # Simply update UI state - the _update_ui_state method now checks auth token directly
+        # Re-read the auth token in case it was edited, then update UI state
+        self._invalidate_auth_token_cache()
         self._update_ui_state()
         logger.info("Preferences dialog closed, UI state refreshed")
 
@@ -955,12 +1176,8 @@ class SonarWindow(Adw.ApplicationWindow):
     
     def copy_focused_request(self) -> None:
         """Copy data from the currently focused request (keyboard shortcut handler)."""
-        # Find the currently expanded request row
-        focused_row = None
-        for row in self.request_rows:
-            if row.get_expanded():
-                focused_row = row
-                break
+        # The currently expanded request row is tracked for the accordion
+        focused_row = self._expanded_row
         
         if focused_row:
             # Trigger the copy button click on the focused row
@@ -968,8 +1185,8 @@ class SonarWindow(Adw.ApplicationWindow):
             self._show_toast("Request data copied to clipboard", timeout=2)
         else:
             # If no row is expanded, copy the most recent request
-            if self.request_rows:
-                most_recent = self.request_rows[0]  # First in list is most recent
+            most_recent = self.request_list.get_row_at_index(0)  # First row is most recent
+            if most_recent:
                 most_recent._on_copy_clicked(None)
                 self._show_toast("Latest request data copied to clipboard", timeout=2)
             else:
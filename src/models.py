@@ -2,19 +2,26 @@
 Data models for the Sonar webhook inspector application.
 """
 
+import itertools
 import json
 import os
+import threading
+from collections import Counter, deque
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class WebhookRequest(BaseModel):
     """Model representing a received webhook request."""
 
+    # Allow derived values to be computed once and cached on the instance
+    model_config = ConfigDict(ignored_types=(cached_property,))
+
     id: str = Field(default_factory=lambda: str(uuid4()))
     timestamp: datetime = Field(default_factory=datetime.now)
     method: str
@@ -29,28 +36,84 @@ class WebhookRequest(BaseModel):
         """String representation of the webhook request."""
         return f"{self.method} {self.path} at {self.timestamp.strftime('%H:%M:%S')}"
 
-    @property
+    @cached_property
     def formatted_body(self) -> str:
-        """Format the body for display."""
+        """Format the body for display (computed once per request)."""
         if isinstance(self.body, bytes):
             try:
                 return self.body.decode('utf-8')
             except UnicodeDecodeError:
                 return f"<binary data: {len(self.body)} bytes>"
         elif isinstance(self.body, dict):
-            import json
             return json.dumps(self.body, indent=2)
         return str(self.body)
 
-    @property
+    @cached_property
     def formatted_headers(self) -> str:
-        """Format headers for display."""
+        """Format headers for display (computed once per request)."""
         return '\n'.join(f"{k}: {v}" for k, v in self.headers.items())
 
+    @cached_property
+    def search_text(self) -> str:
+        """Lowercased path, headers, and body used for text search.
+        
+        Computed on first use and cached; requests are not mutated after creation.
+        """
+        return "\n".join((self.path, self.formatted_headers, self.formatted_body)).lower()
+
+    @cached_property
+    def method_upper(self) -> str:
+        """Uppercased HTTP method used for method filtering."""
+        return self.method.upper()
+
+    def matches(self, query: str = "", method: str | None = None) -> bool:
+        """Check whether the request matches a search query and method filter.
+        
+        Args:
+            query (str): Case-insensitive text to find in path, headers, or body.
+            method (str | None): HTTP method to match, or None for any method.
+            
+        Returns:
+            bool: True if the request passes both filters.
+        """
+        return self.matches_normalized(query.lower(), method.upper() if method else None)
+
+    def matches_normalized(self, query_lower: str, method_upper: str | None) -> bool:
+        """Check filters that the caller has already normalized.
+        
+        Filtering many requests normalizes the filters once instead of per request.
+        
+        Args:
+            query_lower (str): Lowercased search text, or "" for any text.
+            method_upper (str | None): Uppercased HTTP method, or None for any method.
+            
+        Returns:
+            bool: True if the request passes both filters.
+        """
+        if method_upper and self.method_upper != method_upper:
+            return False
+        
+        if query_lower and query_lower not in self.search_text:
+            return False
+        
+        return True
+
+
+# Write buffer size for history exports (bytes)
+_EXPORT_BUFFER_SIZE = 1024 * 1024
+
+# Fields without defaults that a persisted request must provide
+_REQUIRED_REQUEST_FIELDS = frozenset(
+    name for name, field in WebhookRequest.model_fields.items() if field.is_required()
+)
+
 
 class TunnelStatus(BaseModel):
     """Model representing the current tunnel status."""
 
+    # Statuses are replaced rather than edited, so instances can be shared
+    model_config = ConfigDict(frozen=True)
+
     active: bool = False
     public_url: str | None = None
     start_time: datetime | None = None
@@ -68,17 +131,32 @@ class TunnelStatus(BaseModel):
 class RequestStorage:
     """Storage for webhook requests with persistent history support."""
 
-    def __init__(self, max_history: int = 1000, data_dir: str | None = None) -> None:
+    def __init__(self, max_history: int = 1000, data_dir: str | None = None,
+                 save_delay_ms: int = 0) -> None:
         """Initialize the storage.
         
         Args:
             max_history (int): Maximum number of requests to keep in history.
             data_dir (str | None): Directory to store persistent data. If None, uses default.
+            save_delay_ms (int): Coalesce history writes made within this many
+                milliseconds into one, written from a timer thread. 0 writes
+                synchronously on every change.
         """
-        self._requests: list[WebhookRequest] = []  # Active requests
-        self._history: list[WebhookRequest] = []   # Cleared requests history
+        self._requests: deque[WebhookRequest] = deque()  # Active requests, oldest first
+        self._history_items: deque[WebhookRequest] = deque(maxlen=max_history)  # Cleared requests history, newest first
+        self._history_loaded = False  # Whether history.json has been read
+        self._requests_by_id: dict[str, WebhookRequest] = {}  # Active requests keyed by id
+        self._history_index: dict[str, WebhookRequest] = {}  # History requests keyed by id
         self._max_requests = 1000  # Limit to prevent memory issues
         self._max_history = max_history
+        self._history_lock = threading.RLock()  # Guards the history load, mutations, reads and saves
+        self._history_version = 0  # Bumped on every history mutation
+        self._stats_aggregates: tuple | None = None  # Method counts, top paths, time range
+        self._stats_version = -1  # History version the aggregates were computed for
+        self._save_delay_ms = save_delay_ms
+        self._save_timer: threading.Timer | None = None  # Pending deferred history write
+        self._save_pending = False  # History changed since the last write
+        self._write_lock = threading.Lock()  # Orders history snapshots with their writes
         
         # Set up persistent storage
         if data_dir is None:
@@ -87,60 +165,101 @@ class RequestStorage:
         self._data_dir.mkdir(parents=True, exist_ok=True)
         self._history_file = self._data_dir / "history.json"
         
-        # Load existing history from disk
-        self._load_history_from_disk()
+        # Existing history is read from disk on first use, or earlier in the
+        # background through preload_history()
+
+    @property
+    def _history(self) -> deque[WebhookRequest]:
+        """The history deque, loading it from disk on first access."""
+        if not self._history_loaded:
+            self._ensure_history_loaded()
+        return self._history_items
+
+    @property
+    def _history_by_id(self) -> dict[str, WebhookRequest]:
+        """History requests keyed by id, loading the history on first access."""
+        if not self._history_loaded:
+            self._ensure_history_loaded()
+        return self._history_index
+
+    def _ensure_history_loaded(self) -> None:
+        """Load history from disk once, waiting for a load already in progress."""
+        with self._history_lock:
+            if not self._history_loaded:
+                self._load_history_from_disk()
+                self._history_loaded = True
+
+    def preload_history(self) -> None:
+        """Start loading history on a background thread.
+        
+        Lets the history file be parsed while the UI starts up; the first
+        history access waits for the load to finish if it is still running.
+        """
+        if not self._history_loaded:
+            threading.Thread(
+                target=self._ensure_history_loaded, name="sonar-history-load", daemon=True
+            ).start()
 
     def add_request(self, request: WebhookRequest) -> None:
         """Add a new request to storage."""
         self._requests.append(request)
+        self._requests_by_id[request.id] = request
 
         # Remove oldest requests if we exceed the limit
-        if len(self._requests) > self._max_requests:
-            self._requests = self._requests[-self._max_requests:]
+        while len(self._requests) > self._max_requests:
+            del self._requests_by_id[self._requests.popleft().id]
 
     def get_requests(self) -> list[WebhookRequest]:
         """Get all active requests."""
-        return self._requests.copy()
+        return list(self._requests)
 
     def get_history(self) -> list[WebhookRequest]:
         """Get all requests from history."""
-        return self._history.copy()
+        return self._snapshot_history()
 
     def get_request_by_id(self, request_id: str) -> WebhookRequest | None:
         """Get a specific request by ID from active requests."""
-        for request in self._requests:
-            if request.id == request_id:
-                return request
-        return None
+        return self._requests_by_id.get(request_id)
 
     def get_history_request_by_id(self, request_id: str) -> WebhookRequest | None:
         """Get a specific request by ID from history."""
-        for request in self._history:
-            if request.id == request_id:
-                return request
-        return None
+        with self._history_lock:
+            return self._history_by_id.get(request_id)
 
     def clear(self) -> None:
         """Clear active requests (moves them to history)."""
-        # Move current requests to history (most recent first)
-        for request in reversed(self._requests):
-            self._history.insert(0, request)
-        
-        # Limit history size
-        if len(self._history) > self._max_history:
-            self._history = self._history[:self._max_history]
-        
-        # Clear active requests
-        self._requests.clear()
+        # Nothing to move, so skip rewriting the history file
+        if not self._requests:
+            return
         
-        # Save to disk
-        self._save_history_to_disk()
+        with self._history_lock:
+            # Only the first max_history requests fit; the bounded deque would
+            # drop the rest anyway
+            moved = list(itertools.islice(self._requests, self._history.maxlen))
+            
+            # Drop the oldest history entries the bounded deque is about to push out
+            overflow = len(self._history) + len(moved) - self._history.maxlen
+            for _ in range(max(overflow, 0)):
+                del self._history_by_id[self._history.pop().id]
+            
+            # Move current requests to the front of history, keeping their order
+            self._history.extendleft(reversed(moved))
+            self._history_by_id.update((request.id, request) for request in moved)
+            
+            # Clear active requests
+            self._requests.clear()
+            self._requests_by_id.clear()
+            
+            # Save to disk
+            self._history_changed()
 
     def clear_history(self) -> None:
         """Permanently clear all history."""
-        self._history.clear()
-        # Save to disk (empty history)
-        self._save_history_to_disk()
+        with self._history_lock:
+            self._history.clear()
+            self._history_by_id.clear()
+            # Save to disk (empty history)
+            self._history_changed()
 
     def remove_from_history(self, request_id: str) -> bool:
         """Remove a specific request from history.
@@ -151,13 +270,15 @@ class RequestStorage:
         Returns:
             bool: True if removed, False if not found.
         """
-        for i, request in enumerate(self._history):
-            if request.id == request_id:
-                del self._history[i]
-                # Save to disk
-                self._save_history_to_disk()
-                return True
-        return False
+        with self._history_lock:
+            request = self._history_by_id.pop(request_id, None)
+            if request is None:
+                return False
+            
+            self._remove_history_entry(request)
+            # Save to disk
+            self._history_changed()
+            return True
 
     def restore_from_history(self, request_id: str) -> bool:
         """Restore a request from history to active requests.
@@ -168,15 +289,33 @@ class RequestStorage:
         Returns:
             bool: True if restored, False if not found.
         """
-        for i, request in enumerate(self._history):
-            if request.id == request_id:
-                # Move to active requests
-                restored_request = self._history.pop(i)
-                self._requests.insert(0, restored_request)
-                # Save updated history to disk
-                self._save_history_to_disk()
-                return True
-        return False
+        with self._history_lock:
+            request = self._history_by_id.pop(request_id, None)
+            if request is None:
+                return False
+            
+            # Move to active requests
+            self._remove_history_entry(request)
+            self._requests.appendleft(request)
+            self._requests_by_id[request.id] = request
+            # Save updated history to disk
+            self._history_changed()
+            return True
+
+    def _remove_history_entry(self, request: WebhookRequest) -> None:
+        """Delete a request object from the history deque.
+        
+        Called with the history lock held.
+        
+        Args:
+            request (WebhookRequest): The exact object stored in the history.
+        """
+        # Reason: deque.remove would compare every earlier entry with the
+        # model's field-by-field __eq__; an identity test is a pointer compare
+        for i, item in enumerate(self._history):
+            if item is request:
+                del self._history[i]
+                return
 
     def count(self) -> int:
         """Get the number of active requests."""
@@ -186,13 +325,22 @@ class RequestStorage:
         """Get the number of requests in history."""
         return len(self._history)
 
+    @property
+    def has_history(self) -> bool:
+        """Whether history holds any requests (constant time, no copy)."""
+        return bool(self._history)
+
     def get_total_count(self) -> int:
         """Get the total number of requests (active + history)."""
         return len(self._requests) + len(self._history)
 
     def get_latest(self, limit: int = 10) -> list[WebhookRequest]:
         """Get the latest N active requests."""
-        return self._requests[-limit:] if self._requests else []
+        if limit <= 0:
+            return []
+        latest = list(itertools.islice(reversed(self._requests), limit))
+        latest.reverse()
+        return latest
 
     def _load_history_from_disk(self) -> None:
         """Load history from persistent storage."""
@@ -202,42 +350,109 @@ class RequestStorage:
                     history_data = json.load(f)
                     
                 # Convert JSON data back to WebhookRequest objects
+                loaded = []
                 for item in history_data:
                     try:
+                        # Skip entries missing required fields; they are not validated below
+                        if not _REQUIRED_REQUEST_FIELDS <= item.keys():
+                            continue
+                        
                         # Convert timestamp string back to datetime
                         if isinstance(item.get('timestamp'), str):
                             item['timestamp'] = datetime.fromisoformat(item['timestamp'])
                         
-                        request = WebhookRequest(**item)
-                        self._history.append(request)
+                        # Reason: entries were validated when received and are
+                        # written only by _save_history_to_disk, so skip re-validation
+                        request = WebhookRequest.model_construct(**item)
+                        loaded.append(request)
                     except Exception as e:
                         # Skip corrupted entries but continue loading others
                         continue
                 
-                # Ensure we don't exceed max history
-                if len(self._history) > self._max_history:
-                    self._history = self._history[:self._max_history]
+                # Keep the newest entries if the file exceeds max history
+                self._history_items = deque(loaded[:self._max_history], maxlen=self._max_history)
                     
         except Exception as e:
             # If loading fails, start with empty history
-            self._history = []
+            self._history_items = deque(maxlen=self._max_history)
+        
+        self._history_index = {request.id: request for request in self._history_items}
+        self._history_version += 1
+
+    def _snapshot_history(self) -> list[WebhookRequest]:
+        """Copy the history, safe against mutations from other threads."""
+        with self._history_lock:
+            return list(self._history)
 
-    def _save_history_to_disk(self) -> None:
-        """Save history to persistent storage."""
+    def _history_changed(self) -> None:
+        """Record a history mutation and persist the new history.
+        
+        Called with the history lock held.
+        """
+        self._history_version += 1
+        self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        """Write the history now, or once the save delay has passed."""
+        if not self._save_delay_ms:
+            self._save_history_to_disk()
+            return
+        
+        with self._history_lock:
+            self._save_pending = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self._save_delay_ms / 1000, self._on_save_timeout)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def _on_save_timeout(self) -> None:
+        """Write pending history changes (runs on the save timer thread)."""
+        with self._history_lock:
+            # Only forget the timer if it is this one; flush() may have replaced it
+            if self._save_timer is threading.current_thread():
+                self._save_timer = None
+        self._write_pending_history()
+
+    def _write_pending_history(self) -> None:
+        """Write the history to disk if it changed since the last write.
+        
+        Only copying the history holds the history lock, so mutations are not
+        blocked while the file is serialized and written.
+        """
+        # Reason: the snapshot is taken inside the write lock, so writes land
+        # on disk in the order their snapshots were taken
+        with self._write_lock:
+            with self._history_lock:
+                if not self._save_pending:
+                    return
+                self._save_pending = False
+                requests = list(self._history)
+            self._save_history_to_disk(requests)
+
+    def flush(self) -> None:
+        """Write any pending history changes to disk, waiting for in-flight writes."""
+        with self._history_lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is not None:
+            timer.cancel()
+        
+        self._write_pending_history()
+
+    def _save_history_to_disk(self, requests: list[WebhookRequest] | None = None) -> None:
+        """Save history to persistent storage.
+        
+        Args:
+            requests (list[WebhookRequest] | None): Snapshot of the history to
+                write, or None to write the current history.
+        """
+        if requests is None:
+            requests = self._snapshot_history()
+        
         try:
-            # Convert WebhookRequest objects to JSON-serializable format
-            history_data = []
-            for request in self._history:
-                data = request.model_dump()
-                # Convert datetime to ISO string for JSON serialization
-                if isinstance(data.get('timestamp'), datetime):
-                    data['timestamp'] = data['timestamp'].isoformat()
-                history_data.append(data)
-            
             # Write to temporary file first, then rename for atomicity
             temp_file = self._history_file.with_suffix('.tmp')
             with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(history_data, f, indent=2, ensure_ascii=False)
+                self._write_history_json(f, requests)
             
             # Atomic replace
             temp_file.replace(self._history_file)
@@ -246,6 +461,29 @@ class RequestStorage:
             # Log error but don't crash the application
             pass
 
+    def _write_history_json(self, f, requests: list[WebhookRequest],
+                            indent: int | None = None) -> None:
+        """Stream requests to an open text file as a JSON array.
+        
+        Requests are serialized one at a time, so only a single request is
+        held in JSON form at any moment. Without indentation each request is
+        encoded by the C accelerated encoder, which json skips when indenting.
+        
+        Args:
+            f: Writable text file object.
+            requests (list[WebhookRequest]): Requests to write, in order.
+            indent (int | None): Indentation for human-readable output, or None for compact.
+        """
+        f.write("[")
+        for i, request in enumerate(requests):
+            data = request.model_dump()
+            # Convert datetime to ISO string for JSON serialization
+            if isinstance(data.get('timestamp'), datetime):
+                data['timestamp'] = data['timestamp'].isoformat()
+            f.write(",\n" if i else "\n")
+            f.write(json.dumps(data, indent=indent, ensure_ascii=False))
+        f.write("\n]\n" if requests else "]\n")
+
     def search_history(self, query: str, method: str | None = None, 
                       date_from: datetime | None = None, 
                       date_to: datetime | None = None) -> list[WebhookRequest]:
@@ -260,29 +498,23 @@ class RequestStorage:
         Returns:
             list[WebhookRequest]: Filtered history requests.
         """
-        results = []
+        # Normalize the filters once; rows are matched against their cached,
+        # already normalized method and search text
         query_lower = query.lower() if query else ""
+        method_upper = method.upper() if method else None
         
-        for request in self._history:
-            # Filter by method
-            if method and request.method.upper() != method.upper():
-                continue
-            
+        results = []
+        
+        for request in self._snapshot_history():
             # Filter by date range
             if date_from and request.timestamp < date_from:
                 continue
             if date_to and request.timestamp > date_to:
                 continue
             
-            # Filter by query in path, headers, or body
-            if query_lower:
-                searchable_text = (
-                    request.path.lower() +
-                    " " + str(request.headers).lower() +
-                    " " + str(request.formatted_body).lower()
-                )
-                if query_lower not in searchable_text:
-                    continue
+            # Filter by method and by query in path, headers, or body
+            if not request.matches_normalized(query_lower, method_upper):
+                continue
             
             results.append(request)
         
@@ -294,48 +526,69 @@ class RequestStorage:
         Returns:
             dict[str, Any]: Statistics including method counts, date ranges, etc.
         """
-        if not self._history:
-            return {
-                "total_requests": 0,
-                "methods": {},
-                "date_range": None,
-                "most_common_paths": [],
-                "average_requests_per_day": 0
-            }
-        
-        # Count methods
-        method_counts = {}
-        path_counts = {}
-        
-        for request in self._history:
-            method_counts[request.method] = method_counts.get(request.method, 0) + 1
-            path_counts[request.path] = path_counts.get(request.path, 0) + 1
+        with self._history_lock:
+            total_requests = len(self._history)
+            if not total_requests:
+                return {
+                    "total_requests": 0,
+                    "methods": {},
+                    "date_range": None,
+                    "most_common_paths": [],
+                    "average_requests_per_day": 0
+                }
+            
+            method_counts, most_common_paths, earliest, latest = self._get_stats_aggregates()
         
         # Get date range
-        timestamps = [req.timestamp for req in self._history]
         date_range = {
-            "earliest": min(timestamps),
-            "latest": max(timestamps),
-            "span_days": (max(timestamps) - min(timestamps)).days + 1
+            "earliest": earliest,
+            "latest": latest,
+            "span_days": (latest - earliest).days + 1
         }
         
-        # Most common paths
-        most_common_paths = sorted(path_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        
         # Average requests per day
-        avg_per_day = len(self._history) / max(date_range["span_days"], 1)
+        avg_per_day = total_requests / max(date_range["span_days"], 1)
         
         return {
-            "total_requests": len(self._history),
-            "methods": method_counts,
+            "total_requests": total_requests,
+            "methods": dict(method_counts),
             "date_range": date_range,
-            "most_common_paths": most_common_paths,
+            "most_common_paths": list(most_common_paths),
             "average_requests_per_day": round(avg_per_day, 2)
         }
 
+    def _get_stats_aggregates(self) -> tuple:
+        """Get method counts, top 10 paths, and time range of a non-empty history.
+        
+        Aggregates are computed in a single pass, at most once per history mutation.
+        Called with the history lock held.
+        
+        Returns:
+            tuple: (method Counter, most common paths, earliest, latest timestamp).
+        """
+        if self._stats_version != self._history_version:
+            method_counts = Counter()
+            path_counts = Counter()
+            earliest = latest = self._history[0].timestamp
+            
+            for request in self._history:
+                method_counts[request.method] += 1
+                path_counts[request.path] += 1
+                timestamp = request.timestamp
+                if timestamp < earliest:
+                    earliest = timestamp
+                elif timestamp > latest:
+                    latest = timestamp
+            
+            self._stats_aggregates = (method_counts, path_counts.most_common(10), earliest, latest)
+            self._stats_version = self._history_version
+        return self._stats_aggregates
+
     def export_history(self, filepath: str, format: str = "json") -> bool:
         """Export history to file.
         
+        Safe to call from a worker thread: it works on a snapshot of the history.
+        
         Args:
             filepath (str): Path to export file.
             format (str): Export format ("json", "csv", or "txt").
@@ -345,64 +598,62 @@ class RequestStorage:
         """
         try:
             filepath = Path(filepath)
+            requests = self._snapshot_history()
             
             if format.lower() == "json":
-                return self._export_json(filepath)
+                return self._export_json(filepath, requests)
             elif format.lower() == "csv":
-                return self._export_csv(filepath)
+                return self._export_csv(filepath, requests)
             elif format.lower() == "txt":
-                return self._export_txt(filepath)
+                return self._export_txt(filepath, requests)
             else:
                 return False
                 
         except Exception:
             return False
 
-    def _export_json(self, filepath: Path) -> bool:
+    def _export_json(self, filepath: Path, requests: list[WebhookRequest]) -> bool:
         """Export history as JSON."""
         try:
-            history_data = []
-            for request in self._history:
-                data = request.model_dump()
-                if isinstance(data.get('timestamp'), datetime):
-                    data['timestamp'] = data['timestamp'].isoformat()
-                history_data.append(data)
-            
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(history_data, f, indent=2, ensure_ascii=False)
+                self._write_history_json(f, requests, indent=2)
             return True
         except Exception:
             return False
 
-    def _export_csv(self, filepath: Path) -> bool:
+    def _export_csv(self, filepath: Path, requests: list[WebhookRequest]) -> bool:
         """Export history as CSV."""
         try:
             import csv
             
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Timestamp', 'Method', 'Path', 'Content-Type', 'Body'])
-                
-                for request in self._history:
-                    writer.writerow([
+            def rows():
+                for request in requests:
+                    body = request.formatted_body
+                    yield (
                         request.timestamp.isoformat(),
                         request.method,
                         request.path,
                         request.content_type or '',
-                        request.formatted_body[:1000] + '...' if len(request.formatted_body) > 1000 else request.formatted_body
-                    ])
+                        body[:1000] + '...' if len(body) > 1000 else body
+                    )
+            
+            # Large buffer so rows reach the disk in few, big writes
+            with open(filepath, 'w', newline='', encoding='utf-8', buffering=_EXPORT_BUFFER_SIZE) as f:
+                writer = csv.writer(f)
+                writer.writerow(['Timestamp', 'Method', 'Path', 'Content-Type', 'Body'])
+                writer.writerows(rows())
             return True
         except Exception:
             return False
 
-    def _export_txt(self, filepath: Path) -> bool:
+    def _export_txt(self, filepath: Path, requests: list[WebhookRequest]) -> bool:
         """Export history as plain text."""
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write("Sonar Webhook Request History\n")
                 f.write("=" * 50 + "\n\n")
                 
-                for i, request in enumerate(self._history, 1):
+                for i, request in enumerate(requests, 1):
                     f.write(f"Request #{i}\n")
                     f.write(f"Timestamp: {request.timestamp}\n")
                     f.write(f"Method: {request.method}\n")
@@ -3,7 +3,8 @@ Preferences dialog for Sonar application.
 """
 
 import os
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
 
 import gi
 
@@ -11,16 +12,27 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 gi.require_version("Gio", "2.0")
 
-from gi.repository import Adw, Gtk, Gio  # noqa: E402
+from gi.repository import Adw, GLib, Gtk, Gio  # noqa: E402
 
 from .logging_config import get_logger, set_log_level, get_current_level, add_file_logging, remove_file_logging, configure_retention_policy, get_retention_info, cleanup_logs, cleanup_logs_by_age, cleanup_logs_by_size, compress_all_logs, get_cleanup_statistics, emergency_cleanup  # noqa: E402
 
 logger = get_logger(__name__)
 
+# Log levels in the order shown by the log level combo row
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_LOG_LEVEL_INDEX = {name: index for index, name in enumerate(_LOG_LEVELS)}
+
 
 class PreferencesDialog(Adw.PreferencesDialog):
     """Preferences dialog for the Sonar application."""
 
+    # Delay before a burst of edits is committed
+    TOKEN_SAVE_DELAY_MS = 500
+    RETENTION_UPDATE_DELAY_MS = 500
+    
+    # Log level model shared by every dialog instance
+    _log_level_model: Optional[Gtk.StringList] = None
+
     def __init__(self, parent: Optional[Gtk.Widget] = None, tunnel_manager=None, ui_update_callback=None) -> None:
         """Initialize the preferences dialog."""
         super().__init__()
@@ -41,12 +53,33 @@ class PreferencesDialog(Adw.PreferencesDialog):
         
         # Store UI update callback
         self._ui_update_callback = ui_update_callback
+        self._ui_update_queued = False
+        
+        # Pending debounced writes
+        self._token_save_source = 0
+        self._pending_token: Optional[str] = None
+        self._retention_update_source = 0
+        
+        # Last retention policy applied, used to skip no-op updates
+        self._retention_policy: dict = {}
+        
+        # Retention rows are created on first expansion
+        self._retention_rows_built = False
+        
+        # Cached statistics dialog, created on first use
+        self._statistics_dialog: Optional[Adw.MessageDialog] = None
+        
+        # Single worker for log maintenance, created on first use
+        self._executor: Optional[ThreadPoolExecutor] = None
         
         # Create preferences page
         self._create_preferences_page()
         
         # Load current values
         self._load_preferences()
+        
+        # Commit any pending edits when the dialog goes away
+        self.connect("closed", self._on_closed)
     
     def _create_preferences_page(self) -> None:
         """Create the preferences page."""
@@ -63,7 +96,7 @@ class PreferencesDialog(Adw.PreferencesDialog):
         # Ngrok auth token row
         self.auth_token_row = Adw.PasswordEntryRow()
         self.auth_token_row.set_title("Ngrok Auth Token")
-        self.auth_token_row.connect("notify::text", self._on_auth_token_changed)
+        self._auth_token_handler_id = self.auth_token_row.connect("notify::text", self._on_auth_token_changed)
         
         tunnel_group.add(self.auth_token_row)
         
@@ -94,15 +127,13 @@ class PreferencesDialog(Adw.PreferencesDialog):
         self.log_level_row.set_title("Log Level")
         self.log_level_row.set_subtitle("Set the verbosity of application logs")
         
-        # Create log level model
-        log_level_model = Gtk.StringList.new(["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"])
-        self.log_level_row.set_model(log_level_model)
+        # Reuse the log level model across dialog instances
+        if PreferencesDialog._log_level_model is None:
+            PreferencesDialog._log_level_model = Gtk.StringList.new(_LOG_LEVELS)
+        self.log_level_row.set_model(PreferencesDialog._log_level_model)
         
         # Set current log level
-        current_level = get_current_level()
-        log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if current_level in log_levels:
-            self.log_level_row.set_selected(log_levels.index(current_level))
+        self.log_level_row.set_selected(_LOG_LEVEL_INDEX.get(get_current_level(), _LOG_LEVEL_INDEX["INFO"]))
         
         self.log_level_row.connect("notify::selected", self._on_log_level_changed)
         logging_group.add(self.log_level_row)
@@ -114,14 +145,35 @@ class PreferencesDialog(Adw.PreferencesDialog):
         self.file_logging_row.connect("notify::active", self._on_file_logging_changed)
         logging_group.add(self.file_logging_row)
         
+        # Retention and cleanup rows are built on first expansion
+        self.retention_row = Adw.ExpanderRow()
+        self.retention_row.set_title("Retention and Cleanup")
+        self.retention_row.set_subtitle("Log retention, compression and cleanup")
+        self.retention_row.connect("notify::expanded", self._on_retention_row_expanded)
+        logging_group.add(self.retention_row)
+        
+        # Add logging group to page
+        page.add(logging_group)
+        
+        # Add page to dialog
+        self.add(page)
+    
+    def _on_retention_row_expanded(self, expander_row: Adw.ExpanderRow, param) -> None:
+        """Build the retention rows the first time they are shown."""
+        if expander_row.get_expanded() and not self._retention_rows_built:
+            self._build_retention_rows()
+    
+    def _build_retention_rows(self) -> None:
+        """Create the retention and cleanup rows and load their values."""
+        self._retention_rows_built = True
+        
         # Log retention days
         self.retention_days_row = Adw.SpinRow()
         self.retention_days_row.set_title("Log Retention Days")
         self.retention_days_row.set_subtitle("Number of days to keep log files")
         self.retention_days_row.set_range(1, 365)
         self.retention_days_row.set_value(30)  # Default value
-        self.retention_days_row.connect("notify::value", self._on_retention_days_changed)
-        logging_group.add(self.retention_days_row)
+        self.retention_row.add_row(self.retention_days_row)
         
         # Max total size
         self.max_size_row = Adw.SpinRow()
@@ -129,8 +181,7 @@ class PreferencesDialog(Adw.PreferencesDialog):
         self.max_size_row.set_subtitle("Maximum total size of all log files")
         self.max_size_row.set_range(10, 1000)
         self.max_size_row.set_value(100)  # Default value
-        self.max_size_row.connect("notify::value", self._on_max_size_changed)
-        logging_group.add(self.max_size_row)
+        self.retention_row.add_row(self.max_size_row)
         
         # Cleanup interval
         self.cleanup_interval_row = Adw.SpinRow()
@@ -138,16 +189,14 @@ class PreferencesDialog(Adw.PreferencesDialog):
         self.cleanup_interval_row.set_subtitle("How often to run log cleanup")
         self.cleanup_interval_row.set_range(1, 168)  # 1 hour to 1 week
         self.cleanup_interval_row.set_value(24)  # Default value
-        self.cleanup_interval_row.connect("notify::value", self._on_cleanup_interval_changed)
-        logging_group.add(self.cleanup_interval_row)
+        self.retention_row.add_row(self.cleanup_interval_row)
         
         # Log compression switch
         self.compression_enabled_row = Adw.SwitchRow()
         self.compression_enabled_row.set_title("Enable Log Compression")
         self.compression_enabled_row.set_subtitle("Compress old log files to save disk space")
         self.compression_enabled_row.set_active(True)  # Default enabled
-        self.compression_enabled_row.connect("notify::active", self._on_compression_enabled_changed)
-        logging_group.add(self.compression_enabled_row)
+        self.retention_row.add_row(self.compression_enabled_row)
         
         # Compression age days
         self.compression_age_row = Adw.SpinRow()
@@ -155,8 +204,7 @@ class PreferencesDialog(Adw.PreferencesDialog):
         self.compression_age_row.set_subtitle("Compress files older than this many days")
         self.compression_age_row.set_range(1, 365)
         self.compression_age_row.set_value(7)  # Default value
-        self.compression_age_row.connect("notify::value", self._on_compression_age_changed)
-        logging_group.add(self.compression_age_row)
+        self.retention_row.add_row(self.compression_age_row)
         
         # Manual cleanup button
         self.cleanup_button_row = Adw.ActionRow()
@@ -168,7 +216,7 @@ class PreferencesDialog(Adw.PreferencesDialog):
         cleanup_button.set_valign(Gtk.Align.CENTER)
         cleanup_button.connect("clicked", self._on_cleanup_button_clicked)
         self.cleanup_button_row.add_suffix(cleanup_button)
-        logging_group.add(self.cleanup_button_row)
+        self.retention_row.add_row(self.cleanup_button_row)
         
         # Advanced cleanup options
         self.advanced_cleanup_row = Adw.ActionRow()
@@ -201,21 +249,28 @@ class PreferencesDialog(Adw.PreferencesDialog):
         cleanup_box.append(emergency_button)
         
         self.advanced_cleanup_row.add_suffix(cleanup_box)
-        logging_group.add(self.advanced_cleanup_row)
+        self.retention_row.add_row(self.advanced_cleanup_row)
         
-        # Add logging group to page
-        page.add(logging_group)
-        
-        # Add page to dialog
-        self.add(page)
+        # Reason: connect after loading so filling in the current policy
+        # does not schedule a retention update of its own.
+        self._load_retention_preferences()
+        self.retention_days_row.connect("notify::value", self._on_retention_days_changed)
+        self.max_size_row.connect("notify::value", self._on_max_size_changed)
+        self.cleanup_interval_row.connect("notify::value", self._on_cleanup_interval_changed)
+        self.compression_enabled_row.connect("notify::active", self._on_compression_enabled_changed)
+        self.compression_age_row.connect("notify::value", self._on_compression_age_changed)
     
     def _load_preferences(self) -> None:
         """Load current preferences."""
         # Load auth token from GSettings
         auth_token = self.settings.get_string("ngrok-auth-token")
         if auth_token:
-            self.auth_token_row.set_text(auth_token)
-        
+            # Loading the stored token is not an edit, so don't save it back
+            with self.auth_token_row.handler_block(self._auth_token_handler_id):
+                self.auth_token_row.set_text(auth_token)
+    
+    def _load_retention_preferences(self) -> None:
+        """Load the current retention policy into the retention rows."""
         # Load retention policy settings
         try:
             retention_info = get_retention_info()
@@ -225,12 +280,35 @@ class PreferencesDialog(Adw.PreferencesDialog):
                 self.cleanup_interval_row.set_value(retention_info.get('cleanup_interval', 24 * 60 * 60) / 3600)
                 self.compression_enabled_row.set_active(retention_info.get('compression_enabled', True))
                 self.compression_age_row.set_value(retention_info.get('compression_age_days', 7))
+                self._retention_policy = {
+                    'retention_days': retention_info.get('retention_days', 30),
+                    'max_total_size': retention_info.get('max_total_size', 100 * 1024 * 1024),
+                    'cleanup_interval': retention_info.get('cleanup_interval', 24 * 60 * 60),
+                    'enable_cleanup': retention_info.get('cleanup_enabled', True),
+                    'compression_enabled': retention_info.get('compression_enabled', True),
+                    'compression_age_days': retention_info.get('compression_age_days', 7),
+                }
         except Exception as e:
-            logger.warning(f"Failed to load retention policy settings: {e}")
+            logger.warning("Failed to load retention policy settings: %s", e)
     
     def _on_auth_token_changed(self, entry: Adw.PasswordEntryRow, param) -> None:
         """Handle auth token change."""
-        token = entry.get_text().strip()
+        # Reason: notify::text fires per keystroke, so only the final token
+        # is written once typing pauses.
+        self._pending_token = entry.get_text().strip()
+        if self._token_save_source:
+            GLib.source_remove(self._token_save_source)
+        self._token_save_source = GLib.timeout_add(
+            self.TOKEN_SAVE_DELAY_MS, self._flush_token_save
+        )
+    
+    def _flush_token_save(self) -> bool:
+        """Save the pending auth token to GSettings and the environment."""
+        self._token_save_source = 0
+        token = self._pending_token
+        self._pending_token = None
+        if token is None:
+            return GLib.SOURCE_REMOVE
         
         # Save to GSettings
         self.settings.set_string("ngrok-auth-token", token)
@@ -246,27 +324,83 @@ class PreferencesDialog(Adw.PreferencesDialog):
             logger.info("Ngrok auth token removed and cleared from GSettings")
         
         # Trigger immediate UI update if callback is available
-        if self._ui_update_callback:
-            from gi.repository import GLib
-            GLib.idle_add(self._ui_update_callback)
+        if self._ui_update_callback and not self._ui_update_queued:
+            self._ui_update_queued = True
+            GLib.idle_add(self._run_ui_update)
+        
+        return GLib.SOURCE_REMOVE
+    
+    def _run_ui_update(self) -> bool:
+        """Run the queued UI update callback."""
+        self._ui_update_queued = False
+        self._ui_update_callback()
+        return GLib.SOURCE_REMOVE
+    
+    def _on_closed(self, dialog: Adw.PreferencesDialog) -> None:
+        """Commit pending edits immediately when the dialog is closed."""
+        if self._token_save_source:
+            GLib.source_remove(self._token_save_source)
+            self._flush_token_save()
+        if self._retention_update_source:
+            GLib.source_remove(self._retention_update_source)
+            self._apply_retention_policy()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def _run_in_background(self, task: Callable, on_complete: Callable) -> None:
+        """
+        Run a log maintenance task off the main thread.
+        
+        Tasks share one worker, so they run one after another instead of
+        racing each other on the same log files.
+        
+        Args:
+            task: Callable to run on the worker thread
+            on_complete: Called on the main thread with the task result
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sonar-prefs")
+        future = self._executor.submit(task)
+        future.add_done_callback(
+            lambda f: GLib.idle_add(self._on_background_task_done, f, on_complete)
+        )
+    
+    def _on_background_task_done(self, future: Future, on_complete: Callable) -> bool:
+        """Deliver a finished background task's result on the main thread."""
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error("Background log task failed: %s", e)
+            result = {'error': str(e)}
+        on_complete(result)
+        return GLib.SOURCE_REMOVE
     
     def _on_open_ngrok_clicked(self, button: Gtk.Button) -> None:
         """Handle open ngrok website button click."""
         try:
-            import subprocess
-            subprocess.run(["xdg-open", "https://ngrok.com/"], check=False)
+            # Reason: UriLauncher stays in-process and goes through the
+            # OpenURI portal, so it also works inside the Flatpak sandbox.
+            launcher = Gtk.UriLauncher.new("https://ngrok.com/")
+            launcher.launch(self.get_root(), None, self._on_open_ngrok_finished)
         except Exception as e:
-            logger.error(f"Failed to open ngrok website: {e}")
+            logger.error("Failed to open ngrok website: %s", e)
+    
+    def _on_open_ngrok_finished(self, launcher: Gtk.UriLauncher, result: Gio.AsyncResult) -> None:
+        """Report a failure to open the ngrok website."""
+        try:
+            launcher.launch_finish(result)
+        except Exception as e:
+            logger.error("Failed to open ngrok website: %s", e)
     
     def _on_log_level_changed(self, combo_row: Adw.ComboRow, param) -> None:
         """Handle log level change."""
         selected_index = combo_row.get_selected()
-        log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
         
-        if 0 <= selected_index < len(log_levels):
-            new_level = log_levels[selected_index]
+        if 0 <= selected_index < len(_LOG_LEVELS):
+            new_level = _LOG_LEVELS[selected_index]
             set_log_level(new_level)
-            logger.info(f"Log level changed to {new_level}")
+            logger.info("Log level changed to %s", new_level)
     
     def _on_file_logging_changed(self, switch_row: Adw.SwitchRow, param) -> None:
         """Handle file logging toggle."""
@@ -280,52 +414,75 @@ class PreferencesDialog(Adw.PreferencesDialog):
     def _on_retention_days_changed(self, spin_row: Adw.SpinRow, param) -> None:
         """Handle retention days change."""
         retention_days = int(spin_row.get_value())
-        self._update_retention_policy()
-        logger.info(f"Log retention days changed to {retention_days}")
+        self._schedule_retention_update()
+        logger.info("Log retention days changed to %d", retention_days)
     
     def _on_max_size_changed(self, spin_row: Adw.SpinRow, param) -> None:
         """Handle max size change."""
         max_size_mb = int(spin_row.get_value())
-        self._update_retention_policy()
-        logger.info(f"Max log size changed to {max_size_mb}MB")
+        self._schedule_retention_update()
+        logger.info("Max log size changed to %dMB", max_size_mb)
     
     def _on_cleanup_interval_changed(self, spin_row: Adw.SpinRow, param) -> None:
         """Handle cleanup interval change."""
         interval_hours = int(spin_row.get_value())
-        self._update_retention_policy()
-        logger.info(f"Cleanup interval changed to {interval_hours} hours")
+        self._schedule_retention_update()
+        logger.info("Cleanup interval changed to %d hours", interval_hours)
     
     def _on_compression_enabled_changed(self, switch_row: Adw.SwitchRow, param) -> None:
         """Handle compression enabled toggle."""
         compression_enabled = switch_row.get_active()
-        self._update_retention_policy()
-        logger.info(f"Log compression {'enabled' if compression_enabled else 'disabled'}")
+        self._schedule_retention_update()
+        logger.info("Log compression %s", "enabled" if compression_enabled else "disabled")
     
     def _on_compression_age_changed(self, spin_row: Adw.SpinRow, param) -> None:
         """Handle compression age change."""
         compression_age = int(spin_row.get_value())
+        self._schedule_retention_update()
+        logger.info("Compression age changed to %d days", compression_age)
+    
+    def _schedule_retention_update(self) -> None:
+        """Coalesce retention changes into a single policy update."""
+        if self._retention_update_source:
+            GLib.source_remove(self._retention_update_source)
+            self._retention_update_source = 0
+        # Nothing to apply when the rows are back at the committed policy
+        if self._get_retention_policy() == self._retention_policy:
+            return
+        self._retention_update_source = GLib.timeout_add(
+            self.RETENTION_UPDATE_DELAY_MS, self._apply_retention_policy
+        )
+    
+    def _apply_retention_policy(self) -> bool:
+        """Apply the retention policy once a burst of changes has settled."""
+        self._retention_update_source = 0
         self._update_retention_policy()
-        logger.info(f"Compression age changed to {compression_age} days")
+        return GLib.SOURCE_REMOVE
+    
+    def _get_retention_policy(self) -> dict:
+        """Build the retention policy described by the retention rows."""
+        return {
+            'retention_days': int(self.retention_days_row.get_value()),
+            'max_total_size': int(self.max_size_row.get_value()) * 1024 * 1024,  # Convert MB to bytes
+            'cleanup_interval': int(self.cleanup_interval_row.get_value()) * 3600,  # Convert hours to seconds
+            'enable_cleanup': True,
+            'compression_enabled': self.compression_enabled_row.get_active(),
+            'compression_age_days': int(self.compression_age_row.get_value()),
+        }
     
     def _update_retention_policy(self) -> None:
         """Update the retention policy with current settings."""
         try:
-            retention_days = int(self.retention_days_row.get_value())
-            max_size_mb = int(self.max_size_row.get_value())
-            interval_hours = int(self.cleanup_interval_row.get_value())
-            compression_enabled = self.compression_enabled_row.get_active()
-            compression_age = int(self.compression_age_row.get_value())
+            policy = self._get_retention_policy()
+            # Reason: configuring the policy restarts the cleanup thread, so
+            # skip it when the values ended up where they started.
+            if policy == self._retention_policy:
+                return
             
-            configure_retention_policy(
-                retention_days=retention_days,
-                max_total_size=max_size_mb * 1024 * 1024,  # Convert MB to bytes
-                cleanup_interval=interval_hours * 3600,    # Convert hours to seconds
-                enable_cleanup=True,
-                compression_enabled=compression_enabled,
-                compression_age_days=compression_age
-            )
+            configure_retention_policy(**policy)
+            self._retention_policy = policy
         except Exception as e:
-            logger.error(f"Failed to update retention policy: {e}")
+            logger.error("Failed to update retention policy: %s", e)
     
     def _on_cleanup_button_clicked(self, button: Gtk.Button) -> None:
         """Handle manual cleanup button click."""
@@ -333,19 +490,11 @@ class PreferencesDialog(Adw.PreferencesDialog):
             button.set_sensitive(False)
             button.set_label("Cleaning...")
             
-            # Run cleanup in a separate thread to avoid blocking UI
-            def cleanup_task():
-                cleanup_logs()
-                # Update button text back on main thread
-                from gi.repository import GLib
-                GLib.idle_add(lambda: self._cleanup_complete(button))
-            
-            import threading
-            cleanup_thread = threading.Thread(target=cleanup_task, daemon=True)
-            cleanup_thread.start()
+            # Run cleanup in the background to avoid blocking UI
+            self._run_in_background(cleanup_logs, lambda result: self._cleanup_complete(button))
             
         except Exception as e:
-            logger.error(f"Failed to run manual cleanup: {e}")
+            logger.error("Failed to run manual cleanup: %s", e)
             button.set_sensitive(True)
             button.set_label("Clean Now")
     
@@ -361,19 +510,11 @@ class PreferencesDialog(Adw.PreferencesDialog):
             button.set_sensitive(False)
             button.set_label("Compressing...")
             
-            # Run compression in a separate thread
-            def compress_task():
-                result = compress_all_logs()
-                # Update button on main thread
-                from gi.repository import GLib
-                GLib.idle_add(lambda: self._compress_complete(button, result))
-            
-            import threading
-            compress_thread = threading.Thread(target=compress_task, daemon=True)
-            compress_thread.start()
+            # Run compression in the background
+            self._run_in_background(compress_all_logs, lambda result: self._compress_complete(button, result))
             
         except Exception as e:
-            logger.error(f"Failed to compress logs: {e}")
+            logger.error("Failed to compress logs: %s", e)
             button.set_sensitive(True)
             button.set_label("Compress All")
     
@@ -383,12 +524,12 @@ class PreferencesDialog(Adw.PreferencesDialog):
         button.set_label("Compress All")
         
         if 'error' in result:
-            logger.error(f"Compression failed: {result['error']}")
+            logger.error("Compression failed: %s", result['error'])
         else:
             files_compressed = result.get('files_compressed', 0)
             size_saved = result.get('size_saved', 0)
-            logger.info(f"Compression completed: {files_compressed} files compressed, "
-                       f"{size_saved / (1024*1024):.1f} MB saved")
+            logger.info("Compression completed: %d files compressed, %.1f MB saved",
+                        files_compressed, size_saved / (1024 * 1024))
     
     def _on_statistics_clicked(self, button: Gtk.Button) -> None:
         """Handle statistics button click."""
@@ -396,34 +537,44 @@ class PreferencesDialog(Adw.PreferencesDialog):
             stats = get_cleanup_statistics()
             
             if 'error' in stats:
-                logger.error(f"Statistics error: {stats['error']}")
+                logger.error("Statistics error: %s", stats['error'])
+                return
+            if not stats.get('total_files'):
                 return
             
-            # Create and show statistics dialog
-            dialog = Adw.MessageDialog.new(self, "Log File Statistics", "")
+            # Reuse the statistics dialog across clicks
+            if self._statistics_dialog is None:
+                self._statistics_dialog = Adw.MessageDialog.new(self, "Log File Statistics", "")
+                self._statistics_dialog.add_response("close", "Close")
+                self._statistics_dialog.set_hide_on_close(True)
+            dialog = self._statistics_dialog
             
             # Format statistics message
-            stats_text = f"""Total Files: {stats['total_files']}
-Total Size: {stats['total_size_mb']:.1f} MB
-Compressed Files: {stats['compressed_files']}
-Uncompressed Files: {stats['uncompressed_files']}
-Oldest File: {stats['oldest_file_age_days']:.1f} days old
-Compression Ratio: {stats['compression_ratio']:.1f}%
-
-Age Distribution:
-• 0-1 days: {stats['age_distribution']['0-1_days']} files
-• 1-7 days: {stats['age_distribution']['1-7_days']} files
-• 7-30 days: {stats['age_distribution']['7-30_days']} files
-• 30+ days: {stats['age_distribution']['30+_days']} files
-
-Potential savings if all files compressed: {stats['estimated_savings_if_compressed'] / (1024*1024):.1f} MB"""
+            age = stats['age_distribution']
+            lines = (
+                "Total Files: %d" % stats['total_files'],
+                "Total Size: %.1f MB" % stats['total_size_mb'],
+                "Compressed Files: %d" % stats['compressed_files'],
+                "Uncompressed Files: %d" % stats['uncompressed_files'],
+                "Oldest File: %.1f days old" % stats['oldest_file_age_days'],
+                "Compression Ratio: %.1f%%" % stats['compression_ratio'],
+                "",
+                "Age Distribution:",
+                "• 0-1 days: %d files" % age['0-1_days'],
+                "• 1-7 days: %d files" % age['1-7_days'],
+                "• 7-30 days: %d files" % age['7-30_days'],
+                "• 30+ days: %d files" % age['30+_days'],
+                "",
+                "Potential savings if all files compressed: %.1f MB"
+                % (stats['estimated_savings_if_compressed'] / (1024 * 1024)),
+            )
+            stats_text = "\n".join(lines)
             
             dialog.set_body(stats_text)
-            dialog.add_response("close", "Close")
             dialog.present()
             
         except Exception as e:
-            logger.error(f"Failed to get statistics: {e}")
+            logger.error("Failed to get statistics: %s", e)
     
     def _on_emergency_cleanup_clicked(self, button: Gtk.Button) -> None:
         """Handle emergency cleanup button click."""
@@ -449,7 +600,7 @@ Potential savings if all files compressed: {stats['estimated_savings_if_compress
             dialog.present()
             
         except Exception as e:
-            logger.error(f"Failed to show emergency cleanup dialog: {e}")
+            logger.error("Failed to show emergency cleanup dialog: %s", e)
     
     def _perform_emergency_cleanup(self, button: Gtk.Button) -> None:
         """Perform emergency cleanup."""
@@ -457,19 +608,11 @@ Potential savings if all files compressed: {stats['estimated_savings_if_compress
             button.set_sensitive(False)
             button.set_label("Cleaning...")
             
-            # Run emergency cleanup in a separate thread
-            def emergency_task():
-                result = emergency_cleanup()
-                # Update button on main thread
-                from gi.repository import GLib
-                GLib.idle_add(lambda: self._emergency_complete(button, result))
-            
-            import threading
-            emergency_thread = threading.Thread(target=emergency_task, daemon=True)
-            emergency_thread.start()
+            # Run emergency cleanup in the background
+            self._run_in_background(emergency_cleanup, lambda result: self._emergency_complete(button, result))
             
         except Exception as e:
-            logger.error(f"Failed to perform emergency cleanup: {e}")
+            logger.error("Failed to perform emergency cleanup: %s", e)
             button.set_sensitive(True)
             button.set_label("Emergency")
     
@@ -479,9 +622,9 @@ Potential savings if all files compressed: {stats['estimated_savings_if_compress
         button.set_label("Emergency")
         
         if 'error' in result:
-            logger.error(f"Emergency cleanup failed: {result['error']}")
+            logger.error("Emergency cleanup failed: %s", result['error'])
         else:
             files_removed = result.get('files_removed', 0)
             size_freed = result.get('size_freed', 0)
-            logger.info(f"Emergency cleanup completed: {files_removed} files removed, "
-                       f"{size_freed / (1024*1024):.1f} MB freed")
\ No newline at end of file
+            logger.info("Emergency cleanup completed: %d files removed, %.1f MB freed",
+                        files_removed, size_freed / (1024 * 1024))
\ No newline at end of file
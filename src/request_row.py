@@ -3,6 +3,8 @@ Request row widget for displaying webhook requests.
 """
 
 import json
+import shlex
+from urllib.parse import urlencode
 
 import gi
 
@@ -10,7 +12,7 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
 # GTK imports must come after gi.require_version
-from gi.repository import Adw, Gdk, GObject, Gtk  # noqa: E402
+from gi.repository import Adw, Gdk, GLib, GObject, Gtk  # noqa: E402
 
 from .models import WebhookRequest  # noqa: E402
 from .input_sanitizer import sanitize_for_display  # noqa: E402
@@ -18,6 +20,30 @@ from .logging_config import get_logger  # noqa: E402
 
 logger = get_logger(__name__)
 
+# CSS class applied to the method label for each HTTP method
+METHOD_CSS_CLASSES = {
+    "GET": "accent",
+    "POST": "success",
+    "PUT": "warning",
+    "DELETE": "error",
+}
+DEFAULT_METHOD_CSS_CLASS = "accent"
+
+
+class RequestItem(GObject.Object):
+    """List model item wrapping a webhook request."""
+
+    __gtype_name__ = "RequestItem"
+
+    def __init__(self, request: WebhookRequest) -> None:
+        """Initialize the item.
+        
+        Args:
+            request (WebhookRequest): The wrapped webhook request.
+        """
+        super().__init__()
+        self.request = request
+
 
 @Gtk.Template(resource_path="/io/github/tobagin/sonar/ui/request_row.ui")
 class RequestRow(Adw.ExpanderRow):
@@ -45,6 +71,10 @@ class RequestRow(Adw.ExpanderRow):
         super().__init__(**kwargs)
 
         self.request = request
+        self._method_css_class: str | None = None
+
+        # Strings derived from the request, computed on first use
+        self._clear_cached_text()
 
         # Set up the UI
         self._setup_ui()
@@ -64,6 +94,10 @@ class RequestRow(Adw.ExpanderRow):
         self.body_text.set_cursor_visible(False)
         self.body_text.set_monospace(True)
 
+        # The buffers live as long as the views, so resolve them once
+        self._headers_buffer = self.headers_text.get_buffer()
+        self._body_buffer = self.body_text.get_buffer()
+
         # Set up method label styling
         self._style_method_label()
 
@@ -72,57 +106,85 @@ class RequestRow(Adw.ExpanderRow):
         self.copy_button.connect("clicked", self._on_copy_clicked)
         self.copy_headers_button.connect("clicked", self._on_copy_headers_clicked)
         self.copy_body_button.connect("clicked", self._on_copy_body_clicked)
+        self.connect("notify::expanded", self._on_expanded_changed)
 
     def _style_method_label(self) -> None:
         """Apply styling to the method label based on HTTP method."""
-        method = self.request.method.upper()
-
-        # Remove existing CSS classes
-        for css_class in ["success", "warning", "error", "accent"]:
-            self.method_label.remove_css_class(css_class)
-
-        # Add appropriate CSS class
-        if method == "GET":
-            self.method_label.add_css_class("accent")
-        elif method == "POST":
-            self.method_label.add_css_class("success")
-        elif method == "PUT":
-            self.method_label.add_css_class("warning")
-        elif method == "DELETE":
-            self.method_label.add_css_class("error")
-        else:
-            self.method_label.add_css_class("accent")
+        css_class = METHOD_CSS_CLASSES.get(self.request.method.upper(), DEFAULT_METHOD_CSS_CLASS)
+        if css_class == self._method_css_class:
+            return
+
+        # Swap only the class applied by the previous call
+        if self._method_css_class:
+            self.method_label.remove_css_class(self._method_css_class)
+        self.method_label.add_css_class(css_class)
+        self._method_css_class = css_class
 
     def _populate_data(self) -> None:
         """Populate the widget with request data."""
         # Set properties for binding with sanitization
-        self.method = sanitize_for_display(self.request.method, max_length=10)
-        self.path = sanitize_for_display(self.request.path, max_length=200)
-        self.method_path = sanitize_for_display(f"{self.request.method} {self.request.path}", max_length=250)
-        self.timestamp_text = self.request.timestamp.strftime("%H:%M:%S")
-        
+        method = sanitize_for_display(self.request.method, max_length=10)
+        path = sanitize_for_display(self.request.path, max_length=200)
         content_type_text = self.request.content_type or "Not specified"
-        self.content_type = sanitize_for_display(content_type_text, max_length=100)
+        values = {
+            "method": method,
+            "path": path,
+            # Both parts are already sanitized and short enough to fit together
+            "method_path": f"{method} {path}",
+            "timestamp_text": self.request.timestamp.strftime("%H:%M:%S"),
+            "content_type": sanitize_for_display(content_type_text, max_length=100),
+        }
+
+        # Reason: property writes always emit notify::, so only write values
+        # that changed and deliver the notifications together.
+        with self.freeze_notify():
+            for name, value in values.items():
+                if getattr(self, name) != value:
+                    setattr(self, name, value)
+
+        # Header and body text is only filled in once the row is expanded
+        self._details_populated = False
+        if self.get_expanded():
+            self._populate_details()
+
+    def _on_expanded_changed(self, row: Adw.ExpanderRow, pspec) -> None:
+        """Fill in the header and body text the first time the row opens."""
+        if self.get_expanded() and not self._details_populated:
+            self._populate_details()
+
+    def _populate_details(self) -> None:
+        """Populate the header and body text views."""
+        self._details_populated = True
 
         # Set headers with sanitization
-        headers_buffer = self.headers_text.get_buffer()
         headers_text = sanitize_for_display(self.request.formatted_headers, max_length=10000)
-        headers_buffer.set_text(headers_text)
+        self._headers_buffer.set_text(headers_text)
 
         # Set body with minimal sanitization for display
-        body_buffer = self.body_text.get_buffer()
         body_text = self._format_body()
         # For JSON display, avoid over-sanitization that could escape quotes
         if isinstance(self.request.body, (dict, str)) and body_text != "No body":
             # Direct text for JSON - already formatted properly
-            body_buffer.set_text(body_text)
+            self._body_buffer.set_text(body_text)
         else:
             # Use sanitization for other content types
             sanitized_body = sanitize_for_display(body_text, max_length=50000)
-            body_buffer.set_text(sanitized_body)
+            self._body_buffer.set_text(sanitized_body)
+
+    def _clear_cached_text(self) -> None:
+        """Forget strings derived from the current request."""
+        self._cached_body_text: str | None = None
+        self._cached_json: str | None = None
+        self._cached_curl: str | None = None
 
     def _format_body(self) -> str:
         """Format the request body for display."""
+        if self._cached_body_text is None:
+            self._cached_body_text = self._build_body_text()
+        return self._cached_body_text
+
+    def _build_body_text(self) -> str:
+        """Build the display text for the request body."""
         if not self.request.body:
             return "No body"
 
@@ -144,6 +206,10 @@ class RequestRow(Adw.ExpanderRow):
 
         # Try to parse and format JSON string
         if isinstance(body, str):
+            # Reason: only objects and arrays gain from re-indenting, so plain
+            # text skips the parse attempt and its exception entirely.
+            if body.lstrip()[:1] not in ("{", "["):
+                return body
             try:
                 parsed = json.loads(body)
                 return json.dumps(parsed, indent=2, ensure_ascii=False)
@@ -154,6 +220,20 @@ class RequestRow(Adw.ExpanderRow):
 
     def _on_copy_clicked(self, button: Gtk.Button) -> None:
         """Handle copy button click."""
+        try:
+            # Copy to clipboard
+            self._copy_to_clipboard(self._get_request_json())
+
+            # Note: Toast notifications are handled by the calling code
+
+        except Exception as e:
+            logger.error(f"Error copying request data: {e}")
+
+    def _get_request_json(self) -> str:
+        """Get the full request serialized as indented JSON."""
+        if self._cached_json is not None:
+            return self._cached_json
+
         # Create comprehensive request data
         request_data = {
             "id": self.request.id,
@@ -168,17 +248,8 @@ class RequestRow(Adw.ExpanderRow):
         }
 
         # Convert to JSON
-        try:
-            json_data = json.dumps(request_data, indent=2, ensure_ascii=False, default=str)
-
-            # Copy to clipboard
-            clipboard = Gdk.Display.get_default().get_clipboard()
-            clipboard.set(json_data)
-
-            # Note: Toast notifications are handled by the calling code
-
-        except Exception as e:
-            logger.error(f"Error copying request data: {e}")
+        self._cached_json = json.dumps(request_data, indent=2, ensure_ascii=False, default=str)
+        return self._cached_json
 
     def _on_copy_headers_clicked(self, button: Gtk.Button) -> None:
         """Handle copy headers button click."""
@@ -186,8 +257,7 @@ class RequestRow(Adw.ExpanderRow):
             headers_text = self.request.formatted_headers
             
             # Copy to clipboard
-            clipboard = Gdk.Display.get_default().get_clipboard()
-            clipboard.set(headers_text)
+            self._copy_to_clipboard(headers_text)
             
         except Exception as e:
             logger.error(f"Error copying headers: {e}")
@@ -198,12 +268,23 @@ class RequestRow(Adw.ExpanderRow):
             body_text = self._format_body()
             
             # Copy to clipboard
-            clipboard = Gdk.Display.get_default().get_clipboard()
-            clipboard.set(body_text)
+            self._copy_to_clipboard(body_text)
             
         except Exception as e:
             logger.error(f"Error copying body: {e}")
 
+    def _copy_to_clipboard(self, text: str) -> None:
+        """Set the clipboard text once the click handler has returned."""
+        clipboard = self.get_clipboard()
+        # Reason: deferring the set lets the button release finish drawing
+        # before the clipboard takes ownership of the text.
+        GLib.idle_add(self._set_clipboard_text, clipboard, text)
+
+    def _set_clipboard_text(self, clipboard: Gdk.Clipboard, text: str) -> bool:
+        """Idle callback that puts the text on the clipboard."""
+        clipboard.set(text)
+        return GLib.SOURCE_REMOVE
+
     def get_request(self) -> WebhookRequest:
         """Get the associated webhook request."""
         return self.request
@@ -211,20 +292,24 @@ class RequestRow(Adw.ExpanderRow):
     def update_request(self, request: WebhookRequest) -> None:
         """Update the widget with new request data."""
         self.request = request
+        self._clear_cached_text()
         self._populate_data()
         self._style_method_label()
 
     def get_formatted_curl(self) -> str:
         """Get a curl command representation of the request."""
+        if self._cached_curl is not None:
+            return self._cached_curl
+
         curl_parts = [f"curl -X {self.request.method}"]
 
         # Add headers
         for key, value in self.request.headers.items():
-            curl_parts.append(f'-H "{key}: {value}"')
+            curl_parts.append(f"-H {shlex.quote(f'{key}: {value}')}")
 
         # Add query parameters
         if self.request.query_params:
-            query_string = "&".join(f"{k}={v}" for k, v in self.request.query_params.items())
+            query_string = urlencode(self.request.query_params)
             path_with_query = f"{self.request.path}?{query_string}"
         else:
             path_with_query = self.request.path
@@ -237,12 +322,13 @@ class RequestRow(Adw.ExpanderRow):
             elif isinstance(body_str, dict):
                 body_str = json.dumps(body_str)
 
-            curl_parts.append(f"-d '{body_str}'")
+            curl_parts.append(f"-d {shlex.quote(body_str)}")
 
         # Add URL (placeholder)
-        curl_parts.append(f'"https://example.com{path_with_query}"')
+        curl_parts.append(shlex.quote(f"https://example.com{path_with_query}"))
 
-        return " \\\n  ".join(curl_parts)
+        self._cached_curl = " \\\n  ".join(curl_parts)
+        return self._cached_curl
 
     def get_summary(self) -> str:
         """Get a summary of the request."""
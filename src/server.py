@@ -5,7 +5,7 @@ FastAPI server for receiving webhook requests.
 import asyncio
 import json
 import threading
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from typing import Any
 
 import uvicorn
@@ -13,16 +13,75 @@ from fastapi import FastAPI, Request, Response
 from fastapi.responses import JSONResponse
 
 from .models import RequestStorage, WebhookRequest
-from .input_sanitizer import sanitize_webhook_data
+from .input_sanitizer import SanitizationConfig, sanitize_webhook_data
 from .logging_config import get_logger
 from . import __version__
 
 logger = get_logger(__name__)
 
 
+def _parse_and_sanitize(
+    method: str,
+    path: str,
+    headers: Mapping[str, str],
+    body: bytes,
+    query_params: Mapping[str, str],
+    content_type: str,
+) -> tuple[bool, dict[str, Any], list[str]]:
+    """
+    Decode a raw request body and sanitize the webhook data.
+
+    Args:
+        method: HTTP method of the request
+        path: Request path including the leading slash
+        headers: Request headers
+        body: Raw request body
+        query_params: Query string parameters
+        content_type: Value of the Content-Type header, or an empty string
+
+    Returns:
+        Tuple of (is_valid, sanitized_data, warnings)
+    """
+    # Try to parse JSON body
+    parsed_body: Any = body
+
+    if content_type.startswith("application/json") and body:
+        try:
+            # json.loads accepts bytes, no separate decode needed
+            parsed_body = json.loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            parsed_body = body.decode("utf-8", errors="replace")
+    elif body:
+        # Form and other bodies are stored as text; keep undecodable
+        # payloads as bytes so they are validated as binary data.
+        try:
+            parsed_body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            parsed_body = body
+    else:
+        parsed_body = ""
+
+    # Sanitize and validate input data
+    return sanitize_webhook_data(
+        method=method,
+        path=path,
+        headers=headers,
+        body=parsed_body,
+        query_params=query_params,
+        content_type=content_type or None,
+        content_length=len(body) if body else None
+    )
+
+
 class WebhookServer:
     """FastAPI server for receiving webhook requests."""
 
+    # Bodies larger than this are parsed on a worker thread
+    PARSE_IN_THREAD_THRESHOLD = 64 * 1024
+
+    # Bodies larger than this are rejected before being buffered
+    MAX_BODY_SIZE = SanitizationConfig.MAX_BODY_SIZE
+
     def __init__(self, request_storage: RequestStorage) -> None:
         """Initialize the webhook server."""
         self.storage = request_storage
@@ -66,42 +125,37 @@ class WebhookServer:
                 if not path:
                     return {"error": "Use specific endpoints for root requests"}
                     
-                # Get request body
-                body = await request.body()
+                # Get request body, rejecting oversized payloads early
+                body = await self._read_body(request)
+                if body is None:
+                    logger.warning("Rejected oversized webhook body for /%s", path)
+                    return JSONResponse(
+                        status_code=413,
+                        content={
+                            "status": "error",
+                            "message": "Request body too large"
+                        }
+                    )
 
-                # Try to parse JSON body
-                parsed_body: Any = body
+                # Parse and sanitize the body, off the event loop when large
                 content_type = request.headers.get("content-type", "")
-
-                if content_type.startswith("application/json") and body:
-                    try:
-                        parsed_body = json.loads(body.decode("utf-8"))
-                    except (json.JSONDecodeError, UnicodeDecodeError):
-                        parsed_body = body.decode("utf-8", errors="replace")
-                elif content_type.startswith("application/x-www-form-urlencoded") and body:
-                    try:
-                        parsed_body = body.decode("utf-8")
-                    except UnicodeDecodeError:
-                        parsed_body = body
-                elif body:
-                    try:
-                        parsed_body = body.decode("utf-8")
-                    except UnicodeDecodeError:
-                        parsed_body = body
-                else:
-                    parsed_body = ""
-
-                # Sanitize and validate input data
                 request_path = f"/{path}"
-                is_valid, sanitized_data, warnings = sanitize_webhook_data(
-                    method=request.method,
-                    path=request_path,
-                    headers=dict(request.headers),
-                    body=parsed_body,
-                    query_params=dict(request.query_params),
-                    content_type=content_type or None,
-                    content_length=len(body) if body else None
+                # Reason: Starlette's Headers mapping iterates every raw header
+                # line; the dict copy keeps one entry per name, the first one
+                parse_args = (
+                    request.method,
+                    request_path,
+                    dict(request.headers),
+                    body,
+                    request.query_params,
+                    content_type,
                 )
+                if len(body) > self.PARSE_IN_THREAD_THRESHOLD:
+                    is_valid, sanitized_data, warnings = await asyncio.to_thread(
+                        _parse_and_sanitize, *parse_args
+                    )
+                else:
+                    is_valid, sanitized_data, warnings = _parse_and_sanitize(*parse_args)
 
                 # Log warnings if any
                 if warnings:
@@ -165,6 +219,31 @@ class WebhookServer:
                     }
                 )
 
+    async def _read_body(self, request: Request) -> bytes | None:
+        """
+        Read the request body, stopping once it exceeds MAX_BODY_SIZE.
+
+        Args:
+            request: Incoming request
+
+        Returns:
+            The body bytes, or None if the body is too large
+        """
+        # Trust a declared length that is already over the limit
+        try:
+            declared_length = int(request.headers.get("content-length", 0))
+        except ValueError:
+            declared_length = 0
+        if declared_length > self.MAX_BODY_SIZE:
+            return None
+
+        body = bytearray()
+        async for chunk in request.stream():
+            body += chunk
+            if len(body) > self.MAX_BODY_SIZE:
+                return None
+        return bytes(body)
+
     def start(self, port: int = 8000, host: str = "127.0.0.1") -> None:
         """Start the webhook server in a separate thread."""
         if self.is_running:
@@ -185,18 +264,14 @@ class WebhookServer:
             )
             self.server = uvicorn.Server(config)
 
-            # Set up event loop for thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
             try:
                 self.is_running = True
-                loop.run_until_complete(self.server.serve())
+                # uvicorn creates and closes its own event loop for this thread
+                self.server.run()
             except Exception as e:
                 logger.error(f"Server error: {e}")
             finally:
                 self.is_running = False
-                loop.close()
 
         # Start server in separate thread
         self.server_thread = threading.Thread(target=run_server, daemon=True)
@@ -4,6 +4,7 @@ Ngrok tunnel manager for creating public URLs.
 
 import os
 import threading
+import time
 import gi
 
 gi.require_version("Gio", "2.0")
@@ -17,9 +18,10 @@ except ImportError:
 
 # Make ngrok imports optional
 try:
-    from pyngrok import ngrok
+    from pyngrok import conf, installer, ngrok
     from pyngrok.conf import PyngrokConfig
     from pyngrok.exception import PyngrokError
+    from pyngrok.process import is_process_running
     NGROK_AVAILABLE = True
 except ImportError:
     NGROK_AVAILABLE = False
@@ -51,6 +53,9 @@ except ImportError:
     class PyngrokConfig:
         def __init__(self, **kwargs):
             pass
+    
+    def is_process_running(ngrok_path):
+        return False
 
 from .models import TunnelStatus
 from .error_handler import process_error, validate_port, ErrorCategory
@@ -58,17 +63,47 @@ from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Shared status for a tunnel that is stopped without error (TunnelStatus is frozen)
+_INACTIVE_STATUS = TunnelStatus()
+
+# Extra keyword arguments start() passes through to ngrok.connect()
+_ALLOWED_CONNECT_KWARGS = frozenset({"hostname", "bind_tls", "subdomain", "auth", "host_header"})
+
+# Successful ngrok binary checks, keyed by binary path; the binary does
+# not change while the app runs, so these are only looked up once
+_installed_ngrok_paths: set[str] = set()
+_ngrok_versions: dict[str, str] = {}
+
+# The .env file only needs to be read once per process
+_dotenv_loaded = False
+
+
+def _load_dotenv_once() -> None:
+    """Load environment variables from .env the first time it is needed."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
+
 
 class TunnelManager:
     """Manages ngrok tunnels for the webhook server."""
 
+    # Seconds get_tunnels() reuses the agent's last answer
+    TUNNELS_CACHE_TTL = 1.0
+
     def __init__(self) -> None:
         """Initialize the tunnel manager."""
-        load_dotenv()
+        _load_dotenv_once()
         self.tunnel = None
-        self.status = TunnelStatus()
-        self._lock = threading.Lock()
+        self.status = _INACTIVE_STATUS
+        # Guards state changes only; status is replaced wholesale, so readers
+        # can take a snapshot without waiting on a slow start()
+        self._lock = threading.RLock()
         self.auth_token_set = False
+        self._pyngrok_config = None
+        # (monotonic time fetched, tunnels) from the last get_tunnels() call
+        self._tunnels_cache: tuple[float, list] | None = None
         
         # Initialize GSettings
         self.settings = Gio.Settings.new("io.github.tobagin.sonar")
@@ -82,6 +117,13 @@ class TunnelManager:
             )
             return
 
+        # The ngrok configuration is static, so build it once and reuse it
+        self._pyngrok_config = PyngrokConfig(
+            ngrok_path=None,  # Use default path
+            config_path=None,  # Use default config
+            region="us"  # Default region
+        )
+
         # Configure ngrok
         auth_token = self._load_auth_token()
         if auth_token:
@@ -147,12 +189,7 @@ class TunnelManager:
                 os.environ["NGROK_AUTHTOKEN"] = token
                 
                 # Reset status to clear any previous errors
-                self.status = TunnelStatus(
-                    active=False,
-                    public_url=None,
-                    start_time=None,
-                    error=None
-                )
+                self.status = _INACTIVE_STATUS
                 
                 logger.info("Ngrok auth token set successfully")
                 return True
@@ -195,190 +232,241 @@ class TunnelManager:
     def start(self, port: int = 8000, protocol: str = "http", **kwargs) -> TunnelStatus:
         """Start the ngrok tunnel with validation and improved error handling."""
         with self._lock:
-            if not NGROK_AVAILABLE:
-                logger.error("Cannot start tunnel - ngrok is not available")
-                user_error = process_error("Ngrok is not available", "starting tunnel")
-                self.status = TunnelStatus(
-                    active=False,
-                    error=user_error.message
-                )
-                return self.status
-
-            if self.status.active:
-                logger.warning("Tunnel is already active")
-                return self.status
-
-            # Validate port
-            is_valid_port, port_error = validate_port(port)
-            if not is_valid_port:
-                logger.error(f"Invalid port {port}: {port_error.message}")
-                self.status = TunnelStatus(
-                    active=False,
-                    error=port_error.message
-                )
-                return self.status
+            return self._start_locked(port, protocol, **kwargs)
 
-            # Check if auth token is set
-            if not self.auth_token_set:
-                logger.error("Cannot start tunnel without auth token")
-                user_error = process_error("No NGROK_AUTHTOKEN found in environment", "starting tunnel")
-                self.status = TunnelStatus(
-                    active=False,
-                    error=user_error.message
-                )
-                return self.status
+    def _start_locked(self, port: int, protocol: str, **kwargs) -> TunnelStatus:
+        """Start the ngrok tunnel; the caller must hold the lock."""
+        if not NGROK_AVAILABLE:
+            logger.error("Cannot start tunnel - ngrok is not available")
+            user_error = process_error("Ngrok is not available", "starting tunnel")
+            self.status = TunnelStatus(
+                active=False,
+                error=user_error.message
+            )
+            return self.status
 
-            try:
-                logger.info(f"Starting ngrok tunnel on port {port}...")
+        if self.status.active:
+            logger.warning("Tunnel is already active")
+            return self.status
 
-                # Configure ngrok
-                config = PyngrokConfig(
-                    ngrok_path=None,  # Use default path
-                    config_path=None,  # Use default config
-                    region="us"  # Default region
-                )
+        # Validate port
+        is_valid_port, port_error = validate_port(port)
+        if not is_valid_port:
+            logger.error(f"Invalid port {port}: {port_error.message}")
+            self.status = TunnelStatus(
+                active=False,
+                error=port_error.message
+            )
+            return self.status
 
-                # Prepare connection arguments
-                connect_args = {
-                    "proto": protocol,
-                    "pyngrok_config": config
-                }
-                
-                # Add any additional kwargs (hostname, bind_tls, etc.)
-                for key, value in kwargs.items():
-                    if key in ["hostname", "bind_tls", "subdomain", "auth", "host_header"]:
-                        connect_args[key] = value
+        # Check if auth token is set
+        if not self.auth_token_set:
+            logger.error("Cannot start tunnel without auth token")
+            user_error = process_error("No NGROK_AUTHTOKEN found in environment", "starting tunnel")
+            self.status = TunnelStatus(
+                active=False,
+                error=user_error.message
+            )
+            return self.status
 
-                # Create tunnel
-                self.tunnel = ngrok.connect(port, **connect_args)
+        try:
+            logger.info(f"Starting ngrok tunnel on port {port}...")
 
-                # Validate tunnel result
-                if not self.tunnel or not self.tunnel.public_url:
-                    user_error = process_error("Invalid tunnel URL received", "creating tunnel")
-                    self.status = TunnelStatus(
-                        active=False,
-                        error=user_error.message
-                    )
-                    return self.status
+            config = self._pyngrok_config
 
-                public_url = self.tunnel.public_url.strip()
-                if not public_url:
-                    user_error = process_error("Empty tunnel URL received", "creating tunnel")
+            # Reuse a tunnel the running agent already has for this port
+            if not kwargs:
+                existing = self._find_existing_tunnel(port, protocol, config)
+                if existing is not None:
+                    self.tunnel = existing
                     self.status = TunnelStatus(
-                        active=False,
-                        error=user_error.message
+                        active=True,
+                        public_url=existing.public_url,
+                        start_time=existing.data.get("timestamp"),
+                        error=None
                     )
+                    logger.info(f"Reusing existing ngrok tunnel: {existing.public_url}")
                     return self.status
 
-                # Update status
-                self.status = TunnelStatus(
-                    active=True,
-                    public_url=public_url,
-                    start_time=self.tunnel.data.get("timestamp"),
-                    error=None
-                )
+            # Prepare connection arguments
+            connect_args = {
+                "proto": protocol,
+                "pyngrok_config": config
+            }
+            
+            # Add any additional kwargs (hostname, bind_tls, etc.)
+            connect_args.update(
+                {key: value for key, value in kwargs.items() if key in _ALLOWED_CONNECT_KWARGS}
+            )
 
-                logger.info(f"Ngrok tunnel started: {public_url}")
-                return self.status
+            # Create tunnel
+            self.tunnel = ngrok.connect(port, **connect_args)
+            self._tunnels_cache = None
 
-            except PyngrokError as e:
-                logger.error(f"Ngrok error: {e}")
-                user_error = process_error(str(e), "starting tunnel")
+            # Validate tunnel result
+            if not self.tunnel or not self.tunnel.public_url:
+                user_error = process_error("Invalid tunnel URL received", "creating tunnel")
                 self.status = TunnelStatus(
                     active=False,
-                    public_url=None,
-                    start_time=None,
                     error=user_error.message
                 )
                 return self.status
 
-            except Exception as e:
-                logger.error(f"Unexpected error starting tunnel: {e}")
-                user_error = process_error(str(e), "starting tunnel")
+            public_url = self.tunnel.public_url.strip()
+            if not public_url:
+                user_error = process_error("Empty tunnel URL received", "creating tunnel")
                 self.status = TunnelStatus(
                     active=False,
-                    public_url=None,
-                    start_time=None,
                     error=user_error.message
                 )
                 return self.status
 
+            # Update status
+            self.status = TunnelStatus(
+                active=True,
+                public_url=public_url,
+                start_time=self.tunnel.data.get("timestamp"),
+                error=None
+            )
+
+            logger.info(f"Ngrok tunnel started: {public_url}")
+            return self.status
+
+        except PyngrokError as e:
+            logger.error(f"Ngrok error: {e}")
+            user_error = process_error(str(e), "starting tunnel")
+            self.status = TunnelStatus(
+                active=False,
+                public_url=None,
+                start_time=None,
+                error=user_error.message
+            )
+            return self.status
+
+        except Exception as e:
+            logger.error(f"Unexpected error starting tunnel: {e}")
+            user_error = process_error(str(e), "starting tunnel")
+            self.status = TunnelStatus(
+                active=False,
+                public_url=None,
+                start_time=None,
+                error=user_error.message
+            )
+            return self.status
+
+    def _find_existing_tunnel(self, port: int, protocol: str, config: PyngrokConfig):
+        """
+        Find a tunnel to the given local port on an already running agent.
+        
+        Args:
+            port: Local port the tunnel forwards to
+            protocol: Tunnel protocol, e.g. "http" or "tcp"
+            config: Pyngrok configuration used to reach the agent
+        
+        Returns:
+            The matching tunnel, or None if there is none
+        """
+        # Reason: listing tunnels starts (and may download) the ngrok agent,
+        # so only ask when an agent is already running.
+        if not is_process_running(config.ngrok_path):
+            return None
+        
+        try:
+            tunnels = ngrok.get_tunnels(pyngrok_config=config)
+        except Exception as e:
+            logger.debug(f"Could not list existing tunnels: {e}")
+            return None
+        
+        port_suffix = f":{port}"
+        for tunnel in tunnels:
+            upstream = getattr(tunnel, "upstream", None) or {}
+            addr = upstream.get("url") or tunnel.config.get("addr", "")
+            if (str(addr).endswith(port_suffix)
+                    and tunnel.public_url
+                    and tunnel.public_url.startswith(protocol)):
+                return tunnel
+        return None
+
     def stop(self) -> None:
         """Stop the ngrok tunnel with improved error handling."""
         with self._lock:
-            if not NGROK_AVAILABLE:
-                logger.warning("Cannot stop tunnel - ngrok is not available")
-                return
+            self._stop_locked()
 
-            if not self.status.active or not self.tunnel:
-                logger.info("Tunnel is not active")
-                # Ensure status is properly reset even if tunnel object is missing
-                self.status = TunnelStatus(
-                    active=False,
-                    public_url=None,
-                    start_time=None,
-                    error=None
-                )
-                self.tunnel = None
-                return
+    def _stop_locked(self) -> None:
+        """Stop the ngrok tunnel; the caller must hold the lock."""
+        if not NGROK_AVAILABLE:
+            logger.warning("Cannot stop tunnel - ngrok is not available")
+            return
 
-            try:
-                logger.info("Stopping ngrok tunnel...")
+        if not self.status.active or not self.tunnel:
+            logger.info("Tunnel is not active")
+            # Ensure status is properly reset even if tunnel object is missing
+            self.status = _INACTIVE_STATUS
+            self.tunnel = None
+            return
 
-                # Disconnect tunnel
-                ngrok.disconnect(self.tunnel.public_url)
+        try:
+            logger.info("Stopping ngrok tunnel...")
 
-                # Update status
-                self.status = TunnelStatus(
-                    active=False,
-                    public_url=None,
-                    start_time=None,
-                    error=None
-                )
+            # Disconnect tunnel
+            ngrok.disconnect(self.tunnel.public_url)
+            self._tunnels_cache = None
 
-                self.tunnel = None
-                logger.info("Ngrok tunnel stopped successfully")
+            # Update status
+            self.status = _INACTIVE_STATUS
 
-            except Exception as e:
-                logger.error(f"Error stopping tunnel: {e}")
-                user_error = process_error(str(e), "stopping tunnel")
-                
-                # Always mark as inactive even if disconnect failed
-                self.status = TunnelStatus(
-                    active=False,
-                    public_url=None,
-                    start_time=None,
-                    error=user_error.message
-                )
-                self.tunnel = None
+            self.tunnel = None
+            logger.info("Ngrok tunnel stopped successfully")
+
+        except Exception as e:
+            logger.error(f"Error stopping tunnel: {e}")
+            user_error = process_error(str(e), "stopping tunnel")
+            
+            # Always mark as inactive even if disconnect failed
+            self.status = TunnelStatus(
+                active=False,
+                public_url=None,
+                start_time=None,
+                error=user_error.message
+            )
+            self.tunnel = None
 
     def restart(self, port: int = 8000, protocol: str = "http") -> TunnelStatus:
         """Restart the ngrok tunnel."""
-        self.stop()
-        return self.start(port, protocol)
+        # Hold the lock across both steps so no other caller sees the gap
+        with self._lock:
+            self._stop_locked()
+            return self._start_locked(port, protocol)
 
     def get_status(self) -> TunnelStatus:
         """Get the current tunnel status."""
-        with self._lock:
-            return self.status
+        return self.status
 
     def get_public_url(self) -> str | None:
         """Get the public URL if tunnel is active."""
-        with self._lock:
-            return self.status.public_url if self.status.active else None
+        status = self.status
+        return status.public_url if status.active else None
 
     def is_active(self) -> bool:
         """Check if the tunnel is active."""
-        with self._lock:
-            return self.status.active
+        return self.status.active
 
     def get_tunnels(self) -> list:
         """Get all active tunnels."""
         if not NGROK_AVAILABLE:
             return []
         
+        # Reason: each call is an HTTP request to the local agent, and UI
+        # refreshes can ask for the list many times a second.
+        cache = self._tunnels_cache
+        now = time.monotonic()
+        if cache is not None and now - cache[0] < self.TUNNELS_CACHE_TTL:
+            return cache[1]
+        
         try:
-            return ngrok.get_tunnels()
+            tunnels = ngrok.get_tunnels()
+            self._tunnels_cache = (now, tunnels)
+            return tunnels
         except Exception as e:
             logger.error(f"Error getting tunnels: {e}")
             return []
@@ -392,14 +480,10 @@ class TunnelManager:
         try:
             logger.info("Killing all ngrok processes...")
             ngrok.kill()
+            self._tunnels_cache = None
 
             # Update status
-            self.status = TunnelStatus(
-                active=False,
-                public_url=None,
-                start_time=None,
-                error=None
-            )
+            self.status = _INACTIVE_STATUS
 
             self.tunnel = None
             logger.info("All ngrok processes killed")
@@ -407,13 +491,23 @@ class TunnelManager:
         except Exception as e:
             logger.error(f"Error killing ngrok processes: {e}")
 
+    def close(self) -> None:
+        """Stop the tunnel; call this when the manager is no longer needed."""
+        self.stop()
+
+    def __enter__(self) -> "TunnelManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def __del__(self) -> None:
-        """Cleanup when object is destroyed."""
-        try:
-            if self.status.active:
-                self.stop()
-        except Exception:
-            pass  # Ignore errors during cleanup
+        """Warn about a tunnel left running instead of stopping it during GC."""
+        # Reason: stopping takes the lock and makes an HTTP request, which can
+        # hang during interpreter shutdown; owners must call close() instead.
+        status = getattr(self, "status", None)
+        if status is not None and status.active:
+            logger.warning("TunnelManager was garbage collected without close()")
 
     @staticmethod
     def check_installation() -> bool:
@@ -421,10 +515,15 @@ class TunnelManager:
         if not NGROK_AVAILABLE:
             return False
         
+        ngrok_path = conf.get_default().ngrok_path
+        if ngrok_path in _installed_ngrok_paths:
+            return True
+        
         try:
-            # Try to get ngrok version
-            from pyngrok import installer
-            installer.install_ngrok()
+            # Install the binary if it is missing
+            if not os.path.exists(ngrok_path):
+                installer.install_ngrok(ngrok_path)
+            _installed_ngrok_paths.add(ngrok_path)
             return True
         except Exception as e:
             logger.error(f"Ngrok installation check failed: {e}")
@@ -436,9 +535,15 @@ class TunnelManager:
         if not NGROK_AVAILABLE:
             return None
         
+        ngrok_path = conf.get_default().ngrok_path
+        version = _ngrok_versions.get(ngrok_path)
+        if version is not None:
+            return version
+        
         try:
-            from pyngrok import installer
-            return installer.get_ngrok_version()
+            version = ngrok.get_version()[0]
+            _ngrok_versions[ngrok_path] = version
+            return version
         except Exception as e:
             logger.error(f"Error getting ngrok version: {e}")
             return None
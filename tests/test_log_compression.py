@@ -184,6 +184,31 @@ class TestLogCompression(unittest.TestCase):
             assert already_compressed.exists()  # Already compressed file should remain
             assert active_file.exists()  # Active file should remain
 
+    def test_compress_old_files_skips_active_log_by_inode(self):
+        """Test that an old active log file is never compressed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_dir = Path(temp_dir)
+            
+            active_file = log_dir / 'sonar.log'
+            active_file.write_text('active log content')
+            old_time = time.time() - (10 * 24 * 60 * 60)  # 10 days old
+            os.utime(active_file, (old_time, old_time))
+            
+            # A second name for the same file is still the active log
+            linked_file = log_dir / 'linked.log'
+            os.link(active_file, linked_file)
+            
+            config = SonarLoggerConfig()
+            config._log_dir = log_dir
+            config._compression_enabled = True
+            config._compression_age_days = 7
+            
+            files_compressed = config._compress_old_files([active_file, linked_file])
+            
+            assert files_compressed == 0
+            assert active_file.exists()
+            assert linked_file.exists()
+
     def test_compress_old_files_disabled(self):
         """Test compression when disabled."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -83,12 +83,42 @@ class TestSonarLoggerConfig(unittest.TestCase):
             # Test logging to file
             logger = config.get_logger(__name__)
             logger.info("Test message")
+            config.flush()
             
             # Check that message was written to file
             with open(log_file, 'r') as f:
                 content = f.read()
                 assert "Test message" in content
 
+    def test_file_logging_is_buffered(self):
+        """Test that file records are batched until flushed or an error arrives."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / 'buffered.log'
+            
+            config = SonarLoggerConfig()
+            config.configure(
+                log_level='INFO',
+                log_to_file=True,
+                log_file_path=str(log_file),
+                console_logging=False,
+                enable_cleanup=False
+            )
+            
+            logger = config.get_logger(__name__)
+            logger.info("Buffered message")
+            assert "Buffered message" not in log_file.read_text()
+            
+            # ERROR records flush the buffer immediately
+            logger.error("Error message")
+            content = log_file.read_text()
+            assert "Buffered message" in content
+            assert "Error message" in content
+            
+            # Removing file logging flushes pending records
+            logger.info("Pending message")
+            config.remove_file_logging()
+            assert "Pending message" in log_file.read_text()
+
     def test_log_level_change(self):
         """Test changing log level at runtime."""
         config = SonarLoggerConfig()
@@ -140,6 +170,7 @@ class TestSonarLoggerConfig(unittest.TestCase):
             
             logger = config.get_logger(__name__)
             logger.info("Detailed test message")
+            config.flush()
             
             # Check that detailed format is used
             with open(log_file, 'r') as f:
@@ -167,9 +198,11 @@ class TestSonarLoggerConfig(unittest.TestCase):
             # Generate enough log messages to trigger rotation
             for i in range(100):
                 logger.info(f"Log message {i} - this is a long message to fill up the log file")
+            config.flush()
             
             # Check that rotation occurred
             assert log_file.exists()
+            config.remove_file_logging()
             # Note: Actual rotation testing would require more complex setup
 
 
@@ -3,9 +3,12 @@ Tests for the models module.
 """
 
 import json
+import time
 from datetime import datetime
+from unittest.mock import patch
 
 import pytest
+from pydantic import ValidationError
 
 from src.models import RequestStorage, TunnelStatus, WebhookRequest
 
@@ -121,6 +124,54 @@ class TestWebhookRequest:
         assert "Content-Type: application/json" in formatted
         assert "Authorization: Bearer token" in formatted
         assert "User-Agent: Test/1.0" in formatted
+    
+    def test_matches(self):
+        """Test matching against search query and method filters."""
+        req = WebhookRequest(
+            method="POST",
+            path="/hooks/github",
+            headers={"X-Event": "Push"},
+            body={"ref": "refs/heads/main"},
+            query_params={}
+        )
+        
+        assert req.matches()
+        assert req.matches("GITHUB")
+        assert req.matches("push", method="post")
+        assert req.matches("heads/main")
+        assert not req.matches("gitlab")
+        assert not req.matches(method="GET")
+    
+    def test_matches_normalized(self):
+        """Test matching against filters the caller already normalized."""
+        req = WebhookRequest(
+            method="post",
+            path="/hooks/GitHub",
+            headers={},
+            body="",
+            query_params={}
+        )
+        
+        assert req.matches_normalized("github", "POST")
+        assert req.matches_normalized("", None)
+        assert not req.matches_normalized("github", "GET")
+        assert "method_upper" not in req.model_dump()
+    
+    def test_search_text_is_cached(self):
+        """Test the lowercased search text is computed once and not serialized."""
+        req = WebhookRequest(
+            method="GET",
+            path="/Test",
+            headers={"X-Key": "Value"},
+            body="Body",
+            query_params={}
+        )
+        
+        assert req.search_text is req.search_text
+        assert "/test" in req.search_text
+        assert "x-key: value" in req.search_text
+        assert "{" not in req.search_text  # No dict repr of the headers
+        assert "search_text" not in req.model_dump()
 
 
 class TestTunnelStatus:
@@ -156,6 +207,14 @@ class TestTunnelStatus:
         )
         
         assert str(status) == "Error: Connection failed"
+    
+    def test_tunnel_status_is_frozen(self):
+        """Test that tunnel statuses cannot be modified in place."""
+        status = TunnelStatus()
+        
+        with pytest.raises(ValidationError):
+            status.active = True
+        assert status.active is False
 
 
 class TestRequestStorage:
@@ -279,4 +338,334 @@ class TestRequestStorage:
         requests = storage.get_requests()
         assert requests[0].path == "/test2"  # Oldest kept
         assert requests[1].path == "/test3"
-        assert requests[2].path == "/test4"  # Newest
\ No newline at end of file
+        assert requests[2].path == "/test4"  # Newest
+    
+    def test_has_history(self, tmp_path):
+        """Test has_history tracks history mutations."""
+        storage = RequestStorage(data_dir=str(tmp_path))
+        assert not storage.has_history
+        
+        req = WebhookRequest(
+            method="GET",
+            path="/test",
+            headers={},
+            body="",
+            query_params={}
+        )
+        
+        storage.add_request(req)
+        storage.clear()
+        assert storage.has_history
+        
+        assert storage.restore_from_history(req.id)
+        assert not storage.has_history
+        
+        storage.clear()
+        storage.clear_history()
+        assert not storage.has_history
+    
+    def test_clear_moves_requests_to_history(self, tmp_path):
+        """Test clear prepends active requests to history and respects max_history."""
+        storage = RequestStorage(max_history=3, data_dir=str(tmp_path))
+        
+        for batch in (["/a", "/b"], ["/c", "/d"]):
+            for path in batch:
+                storage.add_request(WebhookRequest(
+                    method="GET",
+                    path=path,
+                    headers={},
+                    body="",
+                    query_params={}
+                ))
+            storage.clear()
+        
+        assert storage.count() == 0
+        assert [r.path for r in storage.get_history()] == ["/c", "/d", "/a"]
+        
+        # Clearing with no active requests leaves the history file untouched
+        history_file = tmp_path / "history.json"
+        mtime = history_file.stat().st_mtime_ns
+        storage.clear()
+        assert history_file.stat().st_mtime_ns == mtime
+    
+    def test_search_history_by_method(self, tmp_path):
+        """Test method-filtered search stays in history order across mutations."""
+        storage = RequestStorage(data_dir=str(tmp_path))
+        
+        for method, path in [("GET", "/a"), ("POST", "/b"), ("get", "/c")]:
+            storage.add_request(WebhookRequest(
+                method=method,
+                path=path,
+                headers={},
+                body="",
+                query_params={}
+            ))
+        storage.clear()
+        
+        assert [r.path for r in storage.search_history("", method="GET")] == ["/a", "/c"]
+        assert [r.path for r in storage.search_history("/c", method="get")] == ["/c"]
+        assert [r.path for r in storage.search_history("/C", method="get")] == ["/c"]
+        assert storage.search_history("", method="DELETE") == []
+        
+        first = storage.search_history("", method="GET")[0]
+        assert storage.remove_from_history(first.id)
+        assert [r.path for r in storage.search_history("", method="GET")] == ["/c"]
+    
+    def test_search_history_follows_history_changes(self, tmp_path):
+        """Test search results follow history changes and belong to the caller."""
+        storage = RequestStorage(data_dir=str(tmp_path))
+        
+        storage.add_request(WebhookRequest(
+            method="GET",
+            path="/first",
+            headers={},
+            body="",
+            query_params={}
+        ))
+        storage.clear()
+        
+        results = storage.search_history("first")
+        assert len(results) == 1
+        
+        # Callers get their own list, so mutating it does not affect later searches
+        results.clear()
+        assert len(storage.search_history("first")) == 1
+        
+        storage.add_request(WebhookRequest(
+            method="GET",
+            path="/first/again",
+            headers={},
+            body="",
+            query_params={}
+        ))
+        storage.clear()
+        assert len(storage.search_history("first")) == 2
+    
+    def test_export_history_json(self, tmp_path):
+        """Test JSON export writes the history as a valid JSON array."""
+        storage = RequestStorage(data_dir=str(tmp_path))
+        export_file = tmp_path / "export.json"
+        
+        assert storage.export_history(str(export_file), "json")
+        assert json.loads(export_file.read_text()) == []
+        
+        for path in ("/a", "/b"):
+            storage.add_request(WebhookRequest(
+                method="POST",
+                path=path,
+                headers={"X-Test": "1"},
+                body={"key": "value"},
+                query_params={}
+            ))
+        storage.clear()
+        
+        assert storage.export_history(str(export_file), "json")
+        exported = json.loads(export_file.read_text())
+        assert [item["path"] for item in exported] == ["/a", "/b"]
+        assert exported[0]["body"] == {"key": "value"}
+        
+        # The persisted history uses the same format and reloads cleanly
+        reloaded = RequestStorage(data_dir=str(tmp_path))
+        assert [r.path for r in reloaded.get_history()] == ["/a", "/b"]
+    
+    def test_deferred_history_save(self, tmp_path):
+        """Test deferred saves coalesce changes until flushed."""
+        storage = RequestStorage(data_dir=str(tmp_path), save_delay_ms=60000)
+        history_file = tmp_path / "history.json"
+        
+        for path in ("/a", "/b"):
+            storage.add_request(WebhookRequest(
+                method="GET",
+                path=path,
+                headers={},
+                body="",
+                query_params={}
+            ))
+            storage.clear()
+        
+        assert not history_file.exists()
+        
+        storage.flush()
+        assert [item["path"] for item in json.loads(history_file.read_text())] == ["/b", "/a"]
+    
+    def test_deferred_history_save_after_delay(self, tmp_path):
+        """Test deferred saves reach disk on their own once the delay passes."""
+        storage = RequestStorage(data_dir=str(tmp_path), save_delay_ms=50)
+        history_file = tmp_path / "history.json"
+        
+        storage.add_request(WebhookRequest(
+            method="GET",
+            path="/a",
+            headers={},
+            body="",
+            query_params={}
+        ))
+        storage.clear()
+        assert not history_file.exists()
+        
+        deadline = time.monotonic() + 5
+        while not history_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [item["path"] for item in json.loads(history_file.read_text())] == ["/a"]
+    def test_history_stats(self, tmp_path):
+        """Test history statistics follow history mutations."""
+        storage = RequestStorage(data_dir=str(tmp_path))
+        assert storage.get_history_stats()["total_requests"] == 0
+        
+        for method, path, day in [("GET", "/a", 1), ("POST", "/a", 3), ("GET", "/b", 2)]:
+            storage.add_request(WebhookRequest(
+                method=method,
+                path=path,
+                timestamp=datetime(2024, 1, day),
+                headers={},
+                body="",
+                query_params={}
+            ))
+        storage.clear()
+        
+        stats = storage.get_history_stats()
+        assert stats["total_requests"] == 3
+        assert stats["methods"] == {"GET": 2, "POST": 1}
+        assert stats["most_common_paths"] == [("/a", 2), ("/b", 1)]
+        assert stats["date_range"]["span_days"] == 3
+        
+        post = storage.search_history("", method="POST")[0]
+        assert storage.remove_from_history(post.id)
+        
+        stats = storage.get_history_stats()
+        assert stats["methods"] == {"GET": 2}
+        assert stats["date_range"]["span_days"] == 2
+    
+    def test_load_history_skips_incomplete_entries(self, tmp_path):
+        """Test history loading keeps complete entries and skips incomplete ones."""
+        history_file = tmp_path / "history.json"
+        history_file.write_text(json.dumps([
+            {
+                "id": "kept",
+                "timestamp": "2024-01-01T12:00:00",
+                "method": "GET",
+                "path": "/ok",
+                "headers": {},
+                "body": "",
+                "query_params": {}
+            },
+            {"id": "broken", "path": "/missing-method"}
+        ]))
+        
+        storage = RequestStorage(data_dir=str(tmp_path))
+        history = storage.get_history()
+        
+        assert [r.id for r in history] == ["kept"]
+        assert history[0].timestamp == datetime(2024, 1, 1, 12, 0)
+        assert history[0].matches("/ok", method="GET")
+    
+    def test_lookup_by_id_across_moves(self, tmp_path):
+        """Test id lookups follow requests between active and history."""
+        storage = RequestStorage(data_dir=str(tmp_path))
+        req = WebhookRequest(
+            method="GET",
+            path="/test",
+            headers={},
+            body="",
+            query_params={}
+        )
+        
+        storage.add_request(req)
+        assert storage.get_request_by_id(req.id) is req
+        assert storage.get_history_request_by_id(req.id) is None
+        
+        storage.clear()
+        assert storage.get_request_by_id(req.id) is None
+        assert storage.get_history_request_by_id(req.id) is req
+        
+        assert storage.restore_from_history(req.id)
+        assert storage.get_request_by_id(req.id) is req
+        assert storage.get_history_request_by_id(req.id) is None
+        assert not storage.restore_from_history(req.id)
+        assert not storage.remove_from_history(req.id)
+    
+    def test_remove_old_history_entries(self, tmp_path):
+        """Test removing the oldest history entries one by one."""
+        storage = RequestStorage(max_history=5, data_dir=str(tmp_path))
+        
+        requests = [
+            WebhookRequest(method="GET", path=f"/{i}", headers={}, body="", query_params={})
+            for i in range(7)
+        ]
+        for req in requests:
+            storage.add_request(req)
+        storage.clear()
+        
+        # Only five requests fit; the others are not reachable by id
+        history = storage.get_history()
+        assert history == requests[:5]
+        assert storage.get_history_request_by_id(requests[5].id) is None
+        
+        # Filling the history pushes out its oldest entries and their ids
+        extra = WebhookRequest(method="GET", path="/extra", headers={}, body="", query_params={})
+        storage.add_request(extra)
+        storage.clear()
+        assert storage.get_history()[0] is extra
+        assert storage.get_history_request_by_id(requests[4].id) is None
+        assert not storage.remove_from_history(requests[4].id)
+        
+        for req in reversed(requests[:4]):
+            assert storage.remove_from_history(req.id)
+            assert storage.get_history_request_by_id(req.id) is None
+        assert storage.get_history() == [extra]
+    
+    def test_export_history_csv(self, tmp_path):
+        """Test CSV export writes one row per request and truncates long bodies."""
+        import csv
+        
+        storage = RequestStorage(data_dir=str(tmp_path))
+        for body in ("short", "x" * 1500):
+            storage.add_request(WebhookRequest(
+                method="POST",
+                path="/csv",
+                headers={},
+                body=body,
+                query_params={}
+            ))
+        storage.clear()
+        
+        export_file = tmp_path / "export.csv"
+        assert storage.export_history(str(export_file), "csv")
+        
+        with open(export_file, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        
+        assert rows[0] == ['Timestamp', 'Method', 'Path', 'Content-Type', 'Body']
+        assert [row[4] for row in rows[1:]] == ["short", "x" * 1000 + "..."]
+    
+    def test_history_loaded_lazily(self, tmp_path):
+        """Test history is read on first access or by a background preload."""
+        history_file = tmp_path / "history.json"
+        history_file.write_text(json.dumps([{
+            "id": "lazy-1",
+            "method": "GET",
+            "path": "/lazy",
+            "headers": {},
+            "body": "",
+            "query_params": {}
+        }]))
+        
+        load = RequestStorage._load_history_from_disk
+        with patch.object(RequestStorage, '_load_history_from_disk',
+                          autospec=True, side_effect=load) as mock_load:
+            storage = RequestStorage(data_dir=str(tmp_path))
+            assert mock_load.call_count == 0
+            
+            # The first history access reads the file; later ones reuse it
+            assert storage.count_history() == 1
+            assert [r.path for r in storage.get_history()] == ["/lazy"]
+            assert mock_load.call_count == 1
+        
+        preloaded = RequestStorage(data_dir=str(tmp_path))
+        preloaded.preload_history()
+        assert [r.path for r in preloaded.get_history()] == ["/lazy"]
+        
+        # Lookups by id load the history too
+        by_id = RequestStorage(data_dir=str(tmp_path))
+        assert by_id.get_history_request_by_id("lazy-1").path == "/lazy"
+        assert RequestStorage(data_dir=str(tmp_path)).restore_from_history("lazy-1")
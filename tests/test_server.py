@@ -112,6 +112,19 @@ class TestWebhookServer:
         assert request.query_params["param1"] == "value1"
         assert request.query_params["param2"] == "value2"
     
+    def test_webhook_endpoint_repeated_header(self):
+        """Test the first value of a repeated header is stored."""
+        client = TestClient(self.server.app)
+        
+        response = client.get(
+            "/webhook",
+            headers=[("x-repeated", "first"), ("x-repeated", "second")]
+        )
+        
+        assert response.status_code == 200
+        request = self.storage.get_requests()[0]
+        assert request.headers["x-repeated"] == "first"
+    
     def test_webhook_endpoint_all_methods(self):
         """Test webhook endpoint with various HTTP methods."""
         client = TestClient(self.server.app)
@@ -253,7 +266,20 @@ class TestWebhookServer:
         assert request.body == large_data
         assert request.content_length is not None
         assert request.content_length > 1000000  # Should be > 1MB
-    
+
+    def test_oversized_body_rejected(self):
+        """Test that bodies over the size limit are rejected with 413."""
+        client = TestClient(self.server.app)
+
+        with patch.object(WebhookServer, "MAX_BODY_SIZE", 16):
+            response = client.post("/webhook", content=b"x" * 17)
+            assert response.status_code == 413
+            assert self.storage.count() == 0
+
+            response = client.post("/webhook", content=b"x" * 16)
+            assert response.status_code == 200
+            assert self.storage.count() == 1
+
     def test_empty_body_handling(self):
         """Test handling of empty request bodies."""
         client = TestClient(self.server.app)
@@ -5,9 +5,11 @@ Tests for the tunnel module.
 from unittest.mock import Mock, patch
 
 import pytest
+from pydantic import ValidationError
 from pyngrok.exception import PyngrokError
 
 from src.models import TunnelStatus
+import src.tunnel
 from src.tunnel import TunnelManager
 
 
@@ -18,16 +20,25 @@ class TestTunnelManager:
         """Set up test fixtures."""
         with patch('src.tunnel.load_dotenv'):
             self.manager = TunnelManager()
+        
+        # Forget cached ngrok binary checks between tests
+        src.tunnel._installed_ngrok_paths.clear()
+        src.tunnel._ngrok_versions.clear()
     
     def test_manager_initialization(self):
         """Test manager initialization."""
-        with patch('src.tunnel.load_dotenv') as mock_load_dotenv:
+        with patch('src.tunnel.load_dotenv') as mock_load_dotenv, \
+                patch('src.tunnel._dotenv_loaded', False):
             with patch('src.tunnel.os.getenv') as mock_getenv:
                 with patch('src.tunnel.ngrok.set_auth_token') as mock_set_auth:
                     mock_getenv.return_value = "test_token"
                     
                     manager = TunnelManager()
                     
+                    mock_load_dotenv.assert_called_once()
+                    
+                    # Later managers reuse the already loaded .env
+                    TunnelManager()
                     mock_load_dotenv.assert_called_once()
                     mock_getenv.assert_called_with("NGROK_AUTHTOKEN")
                     mock_set_auth.assert_called_with("test_token")
@@ -69,6 +80,29 @@ class TestTunnelManager:
         assert call_args[0][0] == 8080  # port
         assert call_args[1]["proto"] == "http"
     
+    @patch('src.tunnel.ngrok.connect')
+    @patch('src.tunnel.ngrok.get_tunnels')
+    @patch('src.tunnel.is_process_running', return_value=True)
+    def test_start_reuses_existing_tunnel(self, mock_running, mock_get_tunnels, mock_connect):
+        """Test that a running agent's tunnel to the same port is reused."""
+        self.manager.auth_token_set = True
+        
+        other_tunnel = Mock()
+        other_tunnel.upstream = {"url": "http://localhost:9000"}
+        other_tunnel.public_url = "https://other.ngrok.io"
+        existing_tunnel = Mock()
+        existing_tunnel.upstream = {"url": "http://localhost:8080"}
+        existing_tunnel.public_url = "https://existing.ngrok.io"
+        existing_tunnel.data = {}
+        mock_get_tunnels.return_value = [other_tunnel, existing_tunnel]
+        
+        status = self.manager.start(port=8080)
+        
+        assert status.active is True
+        assert status.public_url == "https://existing.ngrok.io"
+        assert self.manager.tunnel is existing_tunnel
+        mock_connect.assert_not_called()
+    
     @patch('src.tunnel.ngrok.connect')
     @patch('src.tunnel.ngrok.set_auth_token')
     @patch('src.tunnel.os.getenv')
@@ -227,6 +261,31 @@ class TestTunnelManager:
         tunnels = self.manager.get_tunnels()
         assert tunnels == mock_tunnels
     
+    @patch('src.tunnel.ngrok.disconnect')
+    def test_context_manager_closes_tunnel(self, mock_disconnect):
+        """Test that leaving the context stops an active tunnel."""
+        with self.manager as manager:
+            manager.tunnel = Mock(public_url="https://test.ngrok.io")
+            manager.status = TunnelStatus(active=True, public_url="https://test.ngrok.io")
+        
+        mock_disconnect.assert_called_once_with("https://test.ngrok.io")
+        assert self.manager.is_active() is False
+    
+    @patch('src.tunnel.ngrok.get_tunnels')
+    def test_get_tunnels_cached(self, mock_get_tunnels):
+        """Test that the tunnels list is reused for a short time."""
+        mock_get_tunnels.return_value = [Mock()]
+        
+        first = self.manager.get_tunnels()
+        assert self.manager.get_tunnels() is first
+        mock_get_tunnels.assert_called_once()
+        
+        # An expired entry is fetched again
+        self.manager._tunnels_cache = (0.0, first)
+        with patch('src.tunnel.time.monotonic', return_value=self.manager.TUNNELS_CACHE_TTL + 1):
+            self.manager.get_tunnels()
+        assert mock_get_tunnels.call_count == 2
+    
     @patch('src.tunnel.ngrok.get_tunnels')
     def test_get_tunnels_error(self, mock_get_tunnels):
         """Test getting tunnels with error."""
@@ -248,32 +307,46 @@ class TestTunnelManager:
         assert self.manager.status.active is False
         assert self.manager.tunnel is None
     
+    @patch('src.tunnel.os.path.exists', return_value=False)
     @patch('src.tunnel.installer.install_ngrok')
-    def test_check_installation_success(self, mock_install):
+    def test_check_installation_success(self, mock_install, mock_exists):
         """Test checking ngrok installation."""
         mock_install.return_value = None
         
         result = TunnelManager.check_installation()
         assert result is True
         mock_install.assert_called_once()
+        
+        # A successful check is remembered
+        assert TunnelManager.check_installation() is True
+        mock_install.assert_called_once()
     
+    @patch('src.tunnel.os.path.exists', return_value=False)
     @patch('src.tunnel.installer.install_ngrok')
-    def test_check_installation_failure(self, mock_install):
+    def test_check_installation_failure(self, mock_install, mock_exists):
         """Test checking ngrok installation failure."""
         mock_install.side_effect = Exception("Installation failed")
         
         result = TunnelManager.check_installation()
         assert result is False
+        
+        # Failures are retried on the next check
+        mock_install.side_effect = None
+        assert TunnelManager.check_installation() is True
     
-    @patch('src.tunnel.installer.get_ngrok_version')
+    @patch('src.tunnel.ngrok.get_version')
     def test_get_version_success(self, mock_get_version):
         """Test getting ngrok version."""
-        mock_get_version.return_value = "3.5.0"
+        mock_get_version.return_value = ("3.5.0", "8.1.2")
         
         version = TunnelManager.get_version()
         assert version == "3.5.0"
+        
+        # The version is only looked up once
+        assert TunnelManager.get_version() == "3.5.0"
+        mock_get_version.assert_called_once()
     
-    @patch('src.tunnel.installer.get_ngrok_version')
+    @patch('src.tunnel.ngrok.get_version')
     def test_get_version_error(self, mock_get_version):
         """Test getting ngrok version with error."""
         mock_get_version.side_effect = Exception("Version check failed")
@@ -524,9 +597,10 @@ class TestTunnelManager:
         # Should be the same object
         assert retrieved_status is original_status
         
-        # Modifying retrieved status should affect manager
-        retrieved_status.active = False
-        assert not self.manager.status.active
+        # Statuses are frozen, so a caller cannot change the manager's state
+        with pytest.raises(ValidationError):
+            retrieved_status.active = False
+        assert self.manager.status.active
     
     @patch('src.tunnel.ngrok.connect')
     @patch('src.tunnel.ngrok.set_auth_token')